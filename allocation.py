@@ -0,0 +1,139 @@
+"""
+allocation.py
+
+Staff allocation over time.
+
+Every assignment adds its allocation_pct to the employee's load from its
+assignment_date through its end date (its own end_date, else the
+project's; open-ended if neither is set). find_overbooked_periods() turns
+the assignments of the whole organisation into start/stop events, sorts
+them once and sweeps through them, so a full run is O(n log n) in the
+number of assignments and needs no per-employee queries.
+"""
+
+from datetime import timedelta
+
+from db_connections import get_dialect, stream_query
+from records import OverbookedPeriod
+
+
+FULL_ALLOCATION_PCT = 100
+
+_ASSIGNMENT_PERIODS_SQL = """
+    SELECT
+        ep.employee_id,
+        ep.project_id,
+        ep.assignment_date,
+        ep.end_date,
+        p.end_date,
+        ep.allocation_pct
+    FROM EmployeeProjects ep
+    INNER JOIN Projects p ON p.project_id = ep.project_id
+"""
+
+
+def find_overbooked_periods(assignments, limit=FULL_ALLOCATION_PCT):
+    """
+    Find the periods in which employees are allocated over a limit.
+
+    Args:
+        assignments: Iterable of (employee_id, project_id, start, end,
+            allocation_pct) with inclusive date bounds; end is None for
+            open-ended assignments. An end before the start counts as a
+            one-day assignment.
+        limit (int): Highest total allocation that is not overbooked
+
+    Returns:
+        list: OverbookedPeriod records ordered by employee and start date.
+        end_date is None when the overbooking has no end in sight;
+        project_ids lists every project allocated during the period.
+    """
+    # (employee_id, day, allocation delta, project_id); a load change takes
+    # effect on the day it is recorded, so an assignment stops counting the
+    # day after its inclusive end
+    events = []
+    for employee_id, project_id, start, end, allocation_pct in assignments:
+        events.append((employee_id, start, allocation_pct, project_id))
+        if end is not None:
+            events.append((employee_id, max(start, end) + timedelta(days=1),
+                           -allocation_pct, project_id))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    periods = []
+    employee_id = None
+    load = 0
+    active = {}
+    overbooked = None
+
+    for position, (event_employee, day, delta, project_id) in enumerate(events):
+        if event_employee != employee_id:
+            # Open-ended assignments keep the previous employee overbooked
+            if overbooked is not None:
+                periods.append(_close_period(overbooked, None))
+            employee_id, load, active, overbooked = event_employee, 0, {}, None
+
+        load += delta
+        active[project_id] = active.get(project_id, 0) + (1 if delta > 0 else -1)
+        if not active[project_id]:
+            del active[project_id]
+
+        # Judge the load only once every change for this day is applied
+        following = events[position + 1] if position + 1 < len(events) else None
+        if following is not None and following[:2] == (event_employee, day):
+            continue
+
+        if load > limit:
+            if overbooked is None:
+                overbooked = [employee_id, day, load, set(active)]
+            else:
+                overbooked[2] = max(overbooked[2], load)
+                overbooked[3].update(active)
+        elif overbooked is not None:
+            periods.append(_close_period(overbooked, day - timedelta(days=1)))
+            overbooked = None
+
+    if overbooked is not None:
+        periods.append(_close_period(overbooked, None))
+    return periods
+
+
+def _close_period(overbooked, end):
+    employee_id, start, peak, project_ids = overbooked
+    return OverbookedPeriod(
+        (employee_id, start, end, peak, sorted(project_ids)))
+
+
+def get_overbooked_staff(limit=FULL_ALLOCATION_PCT, since=None, use_primary=False):
+    """
+    Find every employee allocated over the limit, across the whole organisation.
+
+    Assignments are streamed from the database in one query and fed to
+    find_overbooked_periods.
+
+    Args:
+        limit (int): Highest total allocation that is not overbooked
+        since (date): Ignore assignments that ended before this day; None
+            to include all history
+
+    Returns:
+        list: OverbookedPeriod records ordered by employee and start date
+    """
+    sql = _ASSIGNMENT_PERIODS_SQL
+    params = []
+    if since is not None:
+        sql += """
+            WHERE COALESCE(ep.end_date, p.end_date) IS NULL
+               OR COALESCE(ep.end_date, p.end_date) >= %s
+        """
+        params.append(get_dialect().adapt_date(since))
+
+    try:
+        rows = stream_query(sql, params, readonly=not use_primary, record=tuple)
+        return find_overbooked_periods(
+            ((employee_id, project_id, start, own_end or project_end, allocation_pct)
+             for employee_id, project_id, start, own_end, project_end, allocation_pct in rows),
+            limit)
+
+    except Exception as e:
+        print(f"Error finding overbooked staff: {e}")
+        return []
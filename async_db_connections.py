@@ -0,0 +1,223 @@
+"""
+async_db_connections.py
+
+asyncio counterparts of the db_connections helpers, backed by asyncpg and
+Motor. Configuration and schema management are shared with db_connections.
+
+Synchronous callers (Streamlit pages, the CLI) run coroutines through
+run_async() / gather(), which execute them on one long-lived background
+event loop so the driver pools survive between calls.
+
+asyncpg only speaks PostgreSQL. With DB_BACKEND=sqlite the async SQL
+managers run their synchronous counterparts in worker threads instead
+(see sync_fallback), so both paths read the same database.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from contextlib import asynccontextmanager
+
+import asyncpg
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from db_connections import (
+    ensure_sql_schema, get_config, get_dialect, missing_mongo_indexes)
+
+
+# ============================================================================
+# EVENT LOOP BRIDGE
+# ============================================================================
+
+_bridge_loop = None
+_bridge_lock = threading.Lock()
+
+
+def _get_bridge_loop():
+    """Start the shared background event loop on first use."""
+    global _bridge_loop
+
+    if _bridge_loop is not None:
+        return _bridge_loop
+
+    with _bridge_lock:
+        if _bridge_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name='async-db-loop', daemon=True)
+            thread.start()
+            _bridge_loop = loop
+        return _bridge_loop
+
+
+def run_async(coro, timeout=None):
+    """
+    Run a coroutine on the shared background loop and wait for it.
+
+    Args:
+        coro: Coroutine to run
+        timeout (float): Seconds to wait before giving up
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_bridge_loop())
+    return future.result(timeout)
+
+
+def gather(*coros, return_exceptions=False, timeout=None):
+    """
+    Run several coroutines concurrently from synchronous code.
+
+    Usage:
+        employee, reviews = gather(
+            async_employee_manager.get_employee_by_id(1),
+            async_performance_reviewer.get_performance_reviews_for_employee(1))
+
+    Returns:
+        list: Results in the order the coroutines were given
+    """
+    async def _gather():
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    return run_async(_gather(), timeout)
+
+
+# ============================================================================
+# SQL DATABASE FUNCTIONS
+# ============================================================================
+
+# Pools are bound to the loop that created them, so keep one per loop
+_pg_pools = weakref.WeakKeyDictionary()
+
+
+def async_sql_supported():
+    """Whether the configured SQL backend can be queried through asyncpg."""
+    return get_dialect().name == 'postgresql'
+
+
+def sync_fallback(sync_func):
+    """
+    Decorate an async SQL function to call sync_func on other backends.
+
+    The synchronous function runs in a worker thread, so gather() still
+    overlaps it with other calls.
+
+    Args:
+        sync_func: Synchronous manager function taking the same arguments
+    """
+    def decorator(async_func):
+        @functools.wraps(async_func)
+        async def wrapper(*args, **kwargs):
+            if not async_sql_supported():
+                return await asyncio.to_thread(sync_func, *args, **kwargs)
+            return await async_func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _create_pg_pool():
+    if not async_sql_supported():
+        raise RuntimeError(
+            f"asyncpg cannot serve DB_BACKEND={get_dialect().name!r}")
+
+    # Make sure the schema is current before serving async queries
+    await asyncio.to_thread(ensure_sql_schema)
+
+    settings = get_config('SQL_POOL_SETTINGS')
+    return await asyncpg.create_pool(
+        get_config('DATABASE_URL'),
+        min_size=settings['min_size'],
+        max_size=settings['max_size'],
+        timeout=10,
+    )
+
+
+async def get_pg_pool():
+    """
+    Get the asyncpg pool for the running event loop.
+
+    Returns:
+        asyncpg.Pool: Connection pool
+    """
+    loop = asyncio.get_running_loop()
+    task = _pg_pools.get(loop)
+    if task is None:
+        task = loop.create_task(_create_pg_pool())
+        _pg_pools[loop] = task
+
+    try:
+        return await task
+    except Exception as e:
+        _pg_pools.pop(loop, None)
+        print(f"Error connecting to PostgreSQL: {e}")
+        raise
+
+
+@asynccontextmanager
+async def async_sql_connection():
+    """
+    Check out a pooled asyncpg connection for the duration of a block.
+
+    Yields:
+        asyncpg.Connection: Database connection
+    """
+    pool = await get_pg_pool()
+    async with pool.acquire(timeout=get_config('SQL_POOL_SETTINGS')['checkout_timeout']) as conn:
+        yield conn
+
+
+async def close_pg_pool():
+    """Close the asyncpg pool of the running event loop."""
+    task = _pg_pools.pop(asyncio.get_running_loop(), None)
+    if task is not None:
+        pool = await task
+        await pool.close()
+
+
+# ============================================================================
+# MONGODB FUNCTIONS
+# ============================================================================
+
+_motor_clients = weakref.WeakKeyDictionary()
+_motor_indexes_checked = set()
+
+
+async def get_async_mongo_collection(name='reviews'):
+    """
+    Get a Motor collection for the running event loop.
+    Declared indexes (db_connections.MONGO_INDEXES) are ensured once per
+    process.
+
+    Args:
+        name (str): Collection name
+
+    Returns:
+        motor.motor_asyncio.AsyncIOMotorCollection: The collection
+    """
+    loop = asyncio.get_running_loop()
+    client = _motor_clients.get(loop)
+    if client is None:
+        client = AsyncIOMotorClient(
+            get_config('MONGO_URI'),
+            serverSelectionTimeoutMS=10000,
+            connectTimeoutMS=10000,
+            socketTimeoutMS=10000
+        )
+        _motor_clients[loop] = client
+
+    collection = client[get_config('MONGO_DB_NAME')][name]
+
+    if name not in _motor_indexes_checked:
+        try:
+            index_information = await collection.index_information()
+            for keys, options in missing_mongo_indexes(name, index_information):
+                await collection.create_index(keys, **options)
+            # Only once the indexes exist, so a transient failure is retried
+            # on the next call
+            _motor_indexes_checked.add(name)
+        except Exception as e:
+            print(f"Warning: could not ensure indexes on '{name}': {e}")
+
+    return collection
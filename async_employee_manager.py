@@ -0,0 +1,32 @@
+import employee_manager
+from async_db_connections import async_sql_connection, sync_fallback
+from records import Employee, build_records
+
+
+@sync_fallback(employee_manager.get_employee_by_id)
+async def get_employee_by_id(employee_id):
+    """Retrieve a single employee by ID."""
+    try:
+        async with async_sql_connection() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {Employee.COLUMNS} FROM Employees WHERE employee_id=$1",
+                employee_id)
+            return Employee(row) if row else None
+
+    except Exception as e:
+        print(f"Error getting employee: {e}")
+        return None
+
+
+@sync_fallback(employee_manager.list_all_employees)
+async def list_all_employees():
+    """Retrieve all employees from the database."""
+    try:
+        async with async_sql_connection() as conn:
+            rows = await conn.fetch(
+                f"SELECT {Employee.COLUMNS} FROM Employees ORDER BY last_name, first_name")
+            return build_records(Employee, rows)
+
+    except Exception as e:
+        print(f"Error listing employees: {e}")
+        return []
@@ -0,0 +1,55 @@
+from async_db_connections import get_async_mongo_collection
+
+
+async def get_performance_reviews_for_employee(employee_id):
+    """Get all performance reviews for a specific employee."""
+    try:
+        collection = await get_async_mongo_collection()
+
+        reviews = await collection.find(
+            {"employee_id": employee_id}
+        ).sort("review_date", -1).to_list(length=None)
+
+        # Convert ObjectId to string for JSON serialization
+        for review in reviews:
+            review['_id'] = str(review['_id'])
+
+        return reviews
+
+    except Exception as e:
+        print(f"Error getting reviews: {e}")
+        return []
+
+
+async def get_reviews_for_employees(employee_ids):
+    """
+    Get performance reviews for many employees with a single query.
+
+    Args:
+        employee_ids: Iterable of employee IDs
+
+    Returns:
+        dict: employee_id -> list of reviews (newest first); employees
+        without reviews map to an empty list
+    """
+    employee_ids = list(employee_ids)
+    reviews_by_employee = {employee_id: [] for employee_id in employee_ids}
+    if not employee_ids:
+        return reviews_by_employee
+
+    try:
+        collection = await get_async_mongo_collection()
+
+        cursor = collection.find(
+            {"employee_id": {"$in": employee_ids}}
+        ).sort("review_date", -1)
+
+        async for review in cursor:
+            review['_id'] = str(review['_id'])
+            reviews_by_employee.setdefault(review['employee_id'], []).append(review)
+
+        return reviews_by_employee
+
+    except Exception as e:
+        print(f"Error getting reviews: {e}")
+        return reviews_by_employee
@@ -0,0 +1,88 @@
+import project_manager
+from async_db_connections import async_sql_connection, sync_fallback
+from records import Project, ProjectAssignment, ProjectMember, build_records
+
+
+@sync_fallback(project_manager.list_all_projects)
+async def list_all_projects():
+    """Retrieve all projects from the database."""
+    try:
+        async with async_sql_connection() as conn:
+            rows = await conn.fetch(
+                f"SELECT {Project.COLUMNS} FROM Projects ORDER BY project_name")
+            return build_records(Project, rows)
+
+    except Exception as e:
+        print(f"Error listing projects: {e}")
+        return []
+
+
+@sync_fallback(project_manager.get_project_by_id)
+async def get_project_by_id(project_id):
+    """Get a specific project by ID."""
+    try:
+        async with async_sql_connection() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {Project.COLUMNS} FROM Projects WHERE project_id=$1",
+                project_id)
+            return Project(row) if row else None
+
+    except Exception as e:
+        print(f"Error getting project: {e}")
+        return None
+
+
+@sync_fallback(project_manager.get_projects_for_employee)
+async def get_projects_for_employee(employee_id):
+    """Get all projects assigned to a specific employee."""
+    try:
+        async with async_sql_connection() as conn:
+            rows = await conn.fetch("""
+                SELECT 
+                    p.project_id,
+                    p.project_name,
+                    p.start_date,
+                    p.end_date,
+                    p.status,
+                    ep.role,
+                    ep.assignment_date,
+                    ep.allocation_pct,
+                    ep.end_date AS assignment_end_date
+                FROM Projects p
+                INNER JOIN EmployeeProjects ep ON p.project_id = ep.project_id
+                WHERE ep.employee_id = $1
+                ORDER BY p.project_name
+            """, employee_id)
+            return build_records(ProjectAssignment, rows)
+
+    except Exception as e:
+        print(f"Error getting projects for employee: {e}")
+        return []
+
+
+@sync_fallback(project_manager.get_employees_for_project)
+async def get_employees_for_project(project_id):
+    """Get all employees assigned to a specific project."""
+    try:
+        async with async_sql_connection() as conn:
+            rows = await conn.fetch("""
+                SELECT 
+                    e.employee_id,
+                    e.first_name,
+                    e.last_name,
+                    e.email,
+                    e.department,
+                    ep.role,
+                    ep.assignment_date,
+                    ep.allocation_pct,
+                    ep.end_date AS assignment_end_date
+                FROM Employees e
+                INNER JOIN EmployeeProjects ep ON e.employee_id = ep.employee_id
+                WHERE ep.project_id = $1
+                ORDER BY e.last_name, e.first_name
+            """, project_id)
+            return build_records(ProjectMember, rows)
+
+    except Exception as e:
+        print(f"Error getting employees for project: {e}")
+        return []
@@ -0,0 +1,98 @@
+"""
+records_benchmark.py
+
+Compare the row shapes the managers can return: per-row dicts (the old
+dict(zip(columns, row)) pattern), records.Employee records, and columnar
+results. For each it measures the memory retained by the result list and
+the time to build a pandas DataFrame from it.
+
+No database is needed; rows are generated to look like fetchall() output.
+
+Run with: python benchmarks/records_benchmark.py [row_count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from records import Employee, build_columns, build_records  # noqa: E402
+
+
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance", "Operations"]
+
+
+def make_rows(count):
+    """Build tuples shaped like a fetchall() of the Employees table."""
+    start = date(2015, 1, 1)
+    created = datetime(2024, 1, 1, 9, 30)
+    values = {
+        'employee_id': lambda i: i,
+        'first_name': lambda i: f"First{i}",
+        'last_name': lambda i: f"Last{i}",
+        'email': lambda i: f"employee{i}@example.com",
+        'hire_date': lambda i: start + timedelta(days=i % 3000),
+        'department': lambda i: DEPARTMENTS[i % len(DEPARTMENTS)],
+        'created_at': lambda i: created,
+        'updated_at': lambda i: created,
+        'version': lambda i: 1,
+    }
+    # Follow Employee.FIELDS so the rows keep matching the record layout
+    columns = [values[name] for name in Employee.FIELDS]
+    return [tuple(column(i) for column in columns) for i in range(count)]
+
+
+def as_dicts(rows):
+    columns = list(Employee.FIELDS)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def as_records(rows):
+    return build_records(Employee, rows)
+
+
+def as_columns(rows):
+    return build_columns(Employee, rows)
+
+
+def measure(name, build, rows, repeat=3):
+    """Report retained memory and build/DataFrame timings for one shape."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(rows)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    build_time = min(_timed(build, rows) for _ in range(repeat))
+    frame_time = min(_timed(pd.DataFrame, result) for _ in range(repeat))
+
+    print(f"{name:<10} {retained / len(rows):>10.1f} B/row "
+          f"{build_time * 1000:>10.1f} ms build "
+          f"{frame_time * 1000:>10.1f} ms DataFrame")
+
+
+def _timed(func, arg):
+    started = time.perf_counter()
+    func(arg)
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(count)
+
+    print(f"{count} rows (row tuples themselves excluded from memory figures)")
+    measure("dicts", as_dicts, rows)
+    measure("records", as_records, rows)
+    measure("columnar", as_columns, rows)
+
+
+if __name__ == "__main__":
+    main()
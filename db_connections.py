@@ -1,10 +1,22 @@
 import sqlite3
 import os
-from pymongo import MongoClient
+import time
+import itertools
+import random
+import contextvars
+from contextlib import contextmanager
+from datetime import timedelta
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import ConnectionFailure
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2 import pool as pg_pool
 import threading
 from pathlib import Path
 from dotenv import load_dotenv
+from dialects import DIALECTS
+from records import build_records
 load_dotenv()
 
 # ============================================================================
@@ -38,6 +50,69 @@ def get_postgres_url():
     )
 
 
+def _read_setting(key, default=None):
+    """Read one setting from Streamlit secrets, then the environment."""
+    # Try Streamlit secrets
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets') and key in st.secrets:
+            return st.secrets[key]
+    except Exception:
+        pass
+
+    # Try environment variable
+    return os.getenv(key, default)
+
+
+def _read_numeric_settings(defaults):
+    """Read several numeric settings, falling back to defaults on bad input."""
+    values = {}
+    for key, default in defaults.items():
+        value = _read_setting(key)
+        try:
+            values[key] = float(value) if value is not None else default
+        except ValueError:
+            print(f"Warning: invalid {key}={value!r}, using {default}")
+            values[key] = default
+    return values
+
+
+def get_replica_settings():
+    """
+    Get optional read-replica settings.
+    Tries Streamlit secrets first, then environment variables.
+
+    Returns:
+        dict: url (None when no replica is configured) and max_lag, the
+        replication lag in seconds tolerated before reads fall back to the
+        primary
+    """
+    max_lag = _read_numeric_settings({'DATABASE_READ_MAX_LAG': 5})
+
+    return {
+        'url': _read_setting('DATABASE_READ_URL') or None,
+        'max_lag': max_lag['DATABASE_READ_MAX_LAG'],
+    }
+
+
+def get_db_backend():
+    """
+    Get the SQL backend the managers run against.
+    Reads DB_BACKEND from Streamlit secrets or the environment:
+    'postgresql' (default) or 'sqlite' for an embedded database at DB_PATH.
+
+    Returns:
+        str: Dialect name
+    """
+    backend = str(_read_setting('DB_BACKEND', 'postgresql')).strip().lower()
+    if backend in ('postgres', 'postgresql', 'pg'):
+        return 'postgresql'
+    if backend == 'sqlite':
+        return 'sqlite'
+    raise ValueError(
+        f"Unsupported DB_BACKEND {backend!r}; use 'postgresql' or 'sqlite'")
+
+
 def get_db_path():
     """
     Get database path that works both locally and on Streamlit Cloud.
@@ -114,45 +189,831 @@ def get_mongo_db_name():
     return 'performance_reviews_db'
 
 
-# Set configuration
-DATABASE_URL = get_postgres_url()
-DB_PATH = get_db_path()
-MONGO_URI = get_mongo_uri()
-MONGO_DB_NAME = get_mongo_db_name()
+def get_sql_pool_settings():
+    """
+    Get PostgreSQL connection pool settings.
+    Tries Streamlit secrets first, then environment variables.
+
+    Returns:
+        dict: min_size, max_size, checkout_timeout (seconds) and
+        validate_after (seconds a connection may sit idle before it is
+        pinged on checkout)
+    """
+    defaults = {
+        'DB_POOL_MIN': 1,
+        'DB_POOL_SIZE': 5,
+        'DB_POOL_TIMEOUT': 30,
+        'DB_POOL_VALIDATE_AFTER': 30,
+    }
+    values = _read_numeric_settings(defaults)
+
+    min_size = max(0, int(values['DB_POOL_MIN']))
+    max_size = max(1, min_size, int(values['DB_POOL_SIZE']))
+
+    return {
+        'min_size': min_size,
+        'max_size': max_size,
+        'checkout_timeout': values['DB_POOL_TIMEOUT'],
+        'validate_after': values['DB_POOL_VALIDATE_AFTER'],
+    }
+
+
+def get_resilience_settings():
+    """
+    Get retry, circuit-breaker and keep-warm settings.
+    Tries Streamlit secrets first, then environment variables.
+
+    Returns:
+        dict: retry_attempts, retry_base_delay and retry_max_delay (seconds),
+        breaker_threshold (consecutive failures before a backend is marked
+        down), breaker_reset (seconds before a trial call is allowed) and
+        keep_warm_interval (seconds, 0 disables the keep-warm thread)
+    """
+    values = _read_numeric_settings({
+        'DB_RETRY_ATTEMPTS': 3,
+        'DB_RETRY_BASE_DELAY': 0.5,
+        'DB_RETRY_MAX_DELAY': 8,
+        'DB_BREAKER_THRESHOLD': 5,
+        'DB_BREAKER_RESET': 30,
+        'DB_KEEP_WARM_INTERVAL': 240,
+    })
+
+    return {
+        'retry_attempts': max(1, int(values['DB_RETRY_ATTEMPTS'])),
+        'retry_base_delay': values['DB_RETRY_BASE_DELAY'],
+        'retry_max_delay': values['DB_RETRY_MAX_DELAY'],
+        'breaker_threshold': max(1, int(values['DB_BREAKER_THRESHOLD'])),
+        'breaker_reset': values['DB_BREAKER_RESET'],
+        'keep_warm_interval': values['DB_KEEP_WARM_INTERVAL'],
+    }
+
+
+def get_prepared_statements_enabled():
+    """
+    Decide whether hot statements are server-side prepared.
+    Reads DB_PREPARED_STATEMENTS (true/false/auto) from Streamlit secrets or
+    the environment. 'auto' (the default) disables them for PgBouncer
+    transaction-pooling endpoints such as Neon's '-pooler' hosts, where a
+    statement prepared on one server connection is not visible on the next.
+
+    Returns:
+        bool: True if statements should be prepared
+    """
+    value = _read_setting('DB_PREPARED_STATEMENTS', 'auto')
+    value = str(value).strip().lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    return '-pooler' not in get_config('DATABASE_URL')
+
+
+def get_stream_itersize():
+    """
+    Get the number of rows streaming queries fetch per round trip.
+    Reads DB_STREAM_ITERSIZE from Streamlit secrets or the environment.
+
+    Returns:
+        int: Rows per fetch (default 2000)
+    """
+    values = _read_numeric_settings({'DB_STREAM_ITERSIZE': 2000})
+    return max(1, int(values['DB_STREAM_ITERSIZE']))
+
+
+# Configuration is resolved on first use so that importing this module
+# never touches secrets, the environment or the network.
+_CONFIG_LOADERS = {
+    'DATABASE_URL': get_postgres_url,
+    'DB_PATH': get_db_path,
+    'MONGO_URI': get_mongo_uri,
+    'MONGO_DB_NAME': get_mongo_db_name,
+    'SQL_POOL_SETTINGS': get_sql_pool_settings,
+    'REPLICA_SETTINGS': get_replica_settings,
+    'DATABASE_READ_URL': lambda: get_replica_settings()['url'],
+    'PREPARED_STATEMENTS': get_prepared_statements_enabled,
+    'RESILIENCE_SETTINGS': get_resilience_settings,
+    'DB_BACKEND': get_db_backend,
+    'STREAM_ITERSIZE': get_stream_itersize,
+}
+_config_cache = {}
+
+
+def get_config(name):
+    """
+    Get a configuration value, resolving it on first use.
+
+    Args:
+        name (str): One of DATABASE_URL, DATABASE_READ_URL, DB_PATH,
+            MONGO_URI, MONGO_DB_NAME, SQL_POOL_SETTINGS, REPLICA_SETTINGS,
+            PREPARED_STATEMENTS, RESILIENCE_SETTINGS or DB_BACKEND
+
+    Returns:
+        The resolved (and cached) configuration value
+    """
+    if name not in _config_cache:
+        _config_cache[name] = _CONFIG_LOADERS[name]()
+    return _config_cache[name]
+
+
+def get_dialect():
+    """
+    Get the SQL dialect of the configured backend.
 
-print(f"Database configuration loaded:")
-print(f" PostgreSQL URL configured")
-print(f"  SQLite Path: {DB_PATH}")
-print(f"  MongoDB Database: {MONGO_DB_NAME}")
+    Returns:
+        dialects.PostgresDialect: The active dialect
+    """
+    return DIALECTS[get_config('DB_BACKEND')]
+
+
+# ============================================================================
+# RESILIENCE
+# ============================================================================
+
+class BackendUnavailableError(Exception):
+    """Raised when a backend cannot be reached or its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated connection failures to one backend.
+
+    The breaker opens after `threshold` consecutive failures. Once `reset`
+    seconds have passed it lets a single trial call through (half-open);
+    success closes it again, failure re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name):
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            reset = get_config('RESILIENCE_SETTINGS')['breaker_reset']
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= reset:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            threshold = get_config('RESILIENCE_SETTINGS')['breaker_threshold']
+            if self.state == self.HALF_OPEN or self.failures >= threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_breakers = {
+    name: CircuitBreaker(name) for name in ('postgres', 'postgres_read', 'mongo')
+}
+
+
+def call_with_retry(backend, func, retry_on):
+    """
+    Call func with bounded retries and jittered exponential backoff,
+    guarded by the backend's circuit breaker.
+
+    Args:
+        backend (str): 'postgres', 'postgres_read' or 'mongo'
+        func: Zero-argument callable that connects to the backend
+        retry_on (tuple): Exception types treated as connection failures
+
+    Returns:
+        The result of func
+
+    Raises:
+        BackendUnavailableError: If the circuit is open or every attempt failed
+    """
+    breaker = _breakers[backend]
+    if not breaker.allow():
+        raise BackendUnavailableError(
+            f"{backend} is unavailable (circuit open after repeated failures)")
+
+    settings = get_config('RESILIENCE_SETTINGS')
+    attempts = settings['retry_attempts']
+
+    for attempt in range(attempts):
+        try:
+            result = func()
+        except retry_on as e:
+            if attempt + 1 >= attempts:
+                breaker.record_failure()
+                raise BackendUnavailableError(
+                    f"{backend} unreachable after {attempts} attempt(s): {e}") from e
+            # Full jitter keeps reconnecting workers from stampeding
+            delay = min(settings['retry_max_delay'],
+                        settings['retry_base_delay'] * 2 ** attempt)
+            time.sleep(random.uniform(0, delay))
+        except Exception:
+            # Not retried, but still a failed attempt: a half-open breaker
+            # must re-open rather than stay half-open and refuse every call
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def get_backend_health():
+    """
+    Get circuit-breaker state per backend.
+
+    Returns:
+        dict: backend -> 'closed', 'open' or 'half-open'
+    """
+    return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+_keep_warm_thread = None
+_keep_warm_stop = threading.Event()
+_keep_warm_lock = threading.Lock()
+
+
+def warm_up():
+    """Open and ping a PostgreSQL and a MongoDB connection."""
+    try:
+        with sql_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+    except Exception as e:
+        print(f"Keep-warm: PostgreSQL unavailable: {e}")
+
+    try:
+        get_mongo_db_collection().database.command('ping')
+    except Exception as e:
+        print(f"Keep-warm: MongoDB unavailable: {e}")
+
+
+def _keep_warm_loop(interval):
+    while not _keep_warm_stop.is_set():
+        warm_up()
+        _keep_warm_stop.wait(interval)
+
+
+def start_keep_warm(interval=None):
+    """
+    Pre-connect now and keep the backends warm from a background thread.
+    Pinging more often than Neon's autosuspend delay stops the first user
+    after an idle period from paying the compute cold start. Safe to call
+    more than once.
+
+    Args:
+        interval (float): Seconds between pings (defaults to
+            DB_KEEP_WARM_INTERVAL; 0 disables)
+
+    Returns:
+        bool: True if the keep-warm thread is running
+    """
+    global _keep_warm_thread
+
+    if interval is None:
+        interval = get_config('RESILIENCE_SETTINGS')['keep_warm_interval']
+    if interval <= 0:
+        return False
+
+    with _keep_warm_lock:
+        if _keep_warm_thread is None or not _keep_warm_thread.is_alive():
+            _keep_warm_stop.clear()
+            _keep_warm_thread = threading.Thread(
+                target=_keep_warm_loop, args=(interval,),
+                name='db-keep-warm', daemon=True)
+            _keep_warm_thread.start()
+    return True
+
+
+def stop_keep_warm():
+    """Stop the keep-warm thread."""
+    _keep_warm_stop.set()
 
 
 # ============================================================================
 # SQL DATABASE FUNCTIONS
 # ============================================================================
 
-def get_sql_connection():
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its pool and when it was last used."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_used = time.monotonic()
+        self.pool_role = None
+        # Names of statements PREPAREd in this server session
+        self.prepared_statements = set()
+
+
+class SQLConnectionPool:
+    """
+    Blocking, validating wrapper around psycopg2's ThreadedConnectionPool.
+
+    The underlying pool is created on first checkout. Checkouts wait up to
+    DB_POOL_TIMEOUT seconds for a free slot instead of failing immediately.
+    """
+
+    def __init__(self, role, url_setting, backend):
+        self.role = role
+        self.url_setting = url_setting
+        self.backend = backend
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'checkouts': 0,
+            'in_use': 0,
+            'validation_failures': 0,
+            'timeouts': 0,
+        }
+
+    def _get_slots(self):
+        if self._slots is None:
+            with self._lock:
+                if self._slots is None:
+                    max_size = get_config('SQL_POOL_SETTINGS')['max_size']
+                    self._slots = threading.BoundedSemaphore(max_size)
+        return self._slots
+
+    def _get_pool(self):
+        if self._pool is not None:
+            return self._pool
+
+        with self._lock:
+            if self._pool is None:
+                settings = get_config('SQL_POOL_SETTINGS')
+                self._pool = pg_pool.ThreadedConnectionPool(
+                    settings['min_size'],
+                    settings['max_size'],
+                    get_config(self.url_setting),
+                    connect_timeout=10,
+                    keepalives=1,
+                    keepalives_idle=30,
+                    connection_factory=PooledConnection,
+                )
+            return self._pool
+
+    def _count(self, key, delta=1):
+        with self._stats_lock:
+            self._stats[key] += delta
+
+    def _connect(self):
+        pool = self._get_pool()
+        conn = pool.getconn()
+        while not _is_connection_usable(conn):
+            self._count('validation_failures')
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        return conn
+
+    def checkout(self):
+        """Borrow a validated connection, waiting for a free slot if needed."""
+        slots = self._get_slots()
+
+        timeout = get_config('SQL_POOL_SETTINGS')['checkout_timeout']
+        if not slots.acquire(timeout=timeout):
+            self._count('timeouts')
+            raise pg_pool.PoolError(
+                f"Timed out waiting for a PostgreSQL {self.role} connection")
+
+        try:
+            conn = call_with_retry(
+                self.backend, self._connect, (psycopg2.OperationalError,))
+            conn.pool_role = self.role
+        except Exception:
+            slots.release()
+            raise
+
+        self._count('checkouts')
+        self._count('in_use')
+        return conn
+
+    def release(self, conn, discard=False):
+        """Hand a connection back; closed or discarded ones are dropped."""
+        try:
+            conn.last_used = time.monotonic()
+            self._pool.putconn(conn, close=discard or bool(conn.closed))
+        finally:
+            self._count('in_use', -1)
+            self._get_slots().release()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        settings = get_config('SQL_POOL_SETTINGS')
+        stats['min_size'] = settings['min_size']
+        stats['max_size'] = settings['max_size']
+        stats['available'] = stats['max_size'] - stats['in_use']
+        stats['initialized'] = self._pool is not None
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+
+_sql_pools = {
+    'primary': SQLConnectionPool('primary', 'DATABASE_URL', 'postgres'),
+    'replica': SQLConnectionPool('replica', 'DATABASE_READ_URL', 'postgres_read'),
+}
+
+# Replica lag is sampled at most this often (seconds)
+_REPLICA_LAG_CHECK_INTERVAL = 5.0
+_replica_lag = {'checked_at': None, 'seconds': 0.0}
+
+# Read-your-writes marker: the monotonic time of the last committed primary
+# session is kept in a per-user mapping (see bind_write_marker). Callers
+# that never bind one share this process-wide mapping, which errs towards
+# reading from the primary.
+_WRITE_MARKER_KEY = '_db_last_primary_write'
+_process_write_marker = {}
+_write_marker_store = contextvars.ContextVar(
+    'write_marker_store', default=_process_write_marker)
+
+
+def _is_connection_usable(conn):
+    """Check a pooled connection before handing it out."""
+    if conn.closed:
+        return False
+
+    idle_for = time.monotonic() - getattr(conn, 'last_used', 0)
+    if idle_for < get_config('SQL_POOL_SETTINGS')['validate_after']:
+        return True
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _replica_within_lag(conn, max_lag):
+    """Check (at most every few seconds) that the replica is fresh enough."""
+    now = time.monotonic()
+    checked_at = _replica_lag['checked_at']
+
+    if checked_at is None or now - checked_at >= _REPLICA_LAG_CHECK_INTERVAL:
+        with conn.cursor() as cursor:
+            # A replica that has replayed everything it received is current,
+            # however long ago the primary last committed; the replay
+            # timestamp only measures lag while replay is behind
+            cursor.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(
+                        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+            """)
+            _replica_lag['seconds'] = float(cursor.fetchone()[0])
+        conn.rollback()
+        _replica_lag['checked_at'] = now
+
+    return _replica_lag['seconds'] <= max_lag
+
+
+def _should_read_from_replica():
+    """Decide whether a read-only checkout may go to the replica."""
+    settings = get_config('REPLICA_SETTINGS')
+    if not settings['url']:
+        return False
+
+    last_write = _write_marker_store.get().get(_WRITE_MARKER_KEY)
+    if last_write is not None and time.monotonic() - last_write < settings['max_lag']:
+        return False
+
+    return True
+
+
+def bind_write_marker(store):
     """
-    Get a NEW PostgreSQL connection for each request.
-    This is simpler and works better with Streamlit's execution model.
+    Keep the read-your-writes marker of the current context in `store`.
+
+    Contexts do not outlive a request: Streamlit, for one, runs every rerun
+    in a fresh thread. Binding a mapping that lives as long as the user's
+    session (e.g. st.session_state) at the start of each request keeps that
+    user's reads on the primary after their own writes, across requests.
+
+    Args:
+        store: Mutable mapping owned by one user session
+    """
+    _write_marker_store.set(store)
+
+
+def note_primary_write():
+    """Keep reads of the current user session on the primary for a while."""
+    _write_marker_store.get()[_WRITE_MARKER_KEY] = time.monotonic()
+
+
+def get_sql_connection(readonly=False):
+    """
+    Borrow a PostgreSQL connection from the shared pool.
+    Connections idle for longer than DB_POOL_VALIDATE_AFTER seconds are
+    pinged first and replaced if the server dropped them.
+
+    With readonly=True the connection comes from the DATABASE_READ_URL
+    replica when one is configured, reachable, lagging by no more than
+    DATABASE_READ_MAX_LAG seconds and no write was made in this user
+    session (see bind_write_marker) within that window; otherwise the
+    primary is used.
+
+    With DB_BACKEND=sqlite a new SQLite connection is returned instead.
+
+    Every connection obtained here must be handed back with
+    release_sql_connection(); prefer the sql_connection() context manager.
+
+    Args:
+        readonly (bool): Route to the read replica if possible
 
     Returns:
         psycopg2.connection: Database connection
+
+    Raises:
+        psycopg2.pool.PoolError: If no connection frees up within
+            DB_POOL_TIMEOUT seconds
     """
-    try:
-        conn = psycopg2.connect(
-            DATABASE_URL,
-            connect_timeout=10,
-            # options='-c statement_timeout=30000'  # 30 second timeout
-        )
+    if get_dialect().name == 'sqlite':
+        conn = get_sqlite_connection()
+        try:
+            _ensure_sql_schema(conn)
+        except Exception:
+            conn.close()
+            raise
         return conn
+
+    if readonly and _should_read_from_replica():
+        replica = _sql_pools['replica']
+        conn = None
+        try:
+            conn = replica.checkout()
+            if _replica_within_lag(conn, get_config('REPLICA_SETTINGS')['max_lag']):
+                return conn
+        except Exception as e:
+            print(f"Warning: read replica unavailable, using primary: {e}")
+        if conn is not None:
+            replica.release(conn)
+
+    primary = _sql_pools['primary']
+    try:
+        conn = primary.checkout()
     except Exception as e:
         print(f"Error connecting to PostgreSQL: {e}")
         raise
 
+    try:
+        _ensure_sql_schema(conn)
+    except Exception as e:
+        primary.release(conn)
+        print(f"Error connecting to PostgreSQL: {e}")
+        raise
+    return conn
+
+
+def release_sql_connection(conn, discard=False):
+    """
+    Return a borrowed connection to the pool.
+    Open transactions are rolled back by the pool; closed or discarded
+    connections are dropped and replaced on a later checkout.
+
+    Args:
+        conn: Connection obtained from get_sql_connection()
+        discard (bool): Close the connection instead of reusing it
+    """
+    try:
+        if isinstance(conn, sqlite3.Connection):
+            conn.close()
+        else:
+            _sql_pools[conn.pool_role or 'primary'].release(conn, discard)
+    except Exception as e:
+        print(f"Error returning PostgreSQL connection to pool: {e}")
+
+
+@contextmanager
+def sql_connection(readonly=False):
+    """
+    Check out a pooled PostgreSQL connection for the duration of a block.
+    The transaction is rolled back if the block raises; committing is left
+    to the caller.
+
+    Args:
+        readonly (bool): Route to the read replica if possible
+
+    Yields:
+        psycopg2.connection: Database connection
+    """
+    conn = get_sql_connection(readonly)
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        release_sql_connection(conn)
+
+
+def get_sql_pool_stats(role='primary'):
+    """
+    Get PostgreSQL connection pool statistics.
+
+    Args:
+        role (str): 'primary' or 'replica'
+
+    Returns:
+        dict: Pool limits and checkout counters
+    """
+    stats = _sql_pools[role].stats()
+    if role == 'replica':
+        stats['lag_seconds'] = _replica_lag['seconds']
+    return stats
+
+
+def close_sql_pool():
+    """Close every pooled PostgreSQL connection."""
+    for pool in _sql_pools.values():
+        pool.close()
+
+
+_stream_ids = itertools.count(1)
+
+
+def stream_query(sql, params=(), itersize=None, readonly=True, record=None):
+    """
+    Yield the rows of a query as dicts without loading them all at once.
+
+    On PostgreSQL the query runs in a named (server-side) cursor and rows
+    arrive `itersize` at a time; other backends fetch in batches of the same
+    size. The generator holds its own connection rather than joining the
+    caller's DataSession, since it stays suspended between rows. Closing it
+    early (break, .close(), garbage collection) closes the cursor and
+    returns the connection.
+
+    Args:
+        sql (str): PostgreSQL-style query
+        params: Query parameters
+        itersize (int): Rows per fetch; defaults to DB_STREAM_ITERSIZE
+        readonly (bool): Route to the read replica if possible
+        record: records.Record subclass to wrap each row in instead of a dict
+
+    Yields:
+        dict or Record: One row per result
+    """
+    itersize = int(itersize or get_config('STREAM_ITERSIZE'))
+    dialect = get_dialect()
+    conn = get_sql_connection(readonly)
+    try:
+        cursor = dialect.server_cursor(
+            conn, f"stream_{next(_stream_ids)}", itersize)
+        try:
+            cursor.execute(sql, params)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(itersize)
+                if not rows:
+                    break
+                if record is not None:
+                    yield from map(record, rows)
+                    continue
+                if columns is None:
+                    columns = [description[0] for description in cursor.description]
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            cursor.close()
+    finally:
+        release_sql_connection(conn)
+
+
+# ============================================================================
+# PREPARED STATEMENTS
+# ============================================================================
+
+# name -> (parameter count, %s statement, $n statement)
+_statements = {}
+_statement_stats = {}
+_statement_lock = threading.Lock()
+
+
+def register_statement(name, sql):
+    """
+    Register a hot statement to be server-side prepared on each pooled
+    connection the first time it runs there.
+
+    Args:
+        name (str): Statement name (a valid SQL identifier)
+        sql (str): Statement using %s placeholders
+
+    Returns:
+        str: The statement name, for use with execute_statement()
+    """
+    parts = sql.split('%s')
+    text = parts[0] + ''.join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+
+    with _statement_lock:
+        _statements[name] = (len(parts) - 1, sql, text)
+        _statement_stats.setdefault(name, {'executions': 0, 'prepares': 0})
+    return name
+
+
+def execute_statement(cursor, name, params=()):
+    """
+    Execute a registered statement on a cursor.
+    Uses PREPARE/EXECUTE on pooled PostgreSQL connections and a plain
+    execute everywhere else (or when DB_PREPARED_STATEMENTS is off).
+
+    Args:
+        cursor: Cursor to execute on
+        name (str): Name given to register_statement()
+        params (tuple): Statement parameters
+    """
+    param_count, sql, text = _statements[name]
+    prepared = getattr(cursor.connection, 'prepared_statements', None)
+
+    if prepared is None or not get_config('PREPARED_STATEMENTS'):
+        cursor.execute(sql, params)
+    else:
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {text}")
+            prepared.add(name)
+            with _statement_lock:
+                _statement_stats[name]['prepares'] += 1
+
+        placeholders = ', '.join(['%s'] * param_count)
+        try:
+            cursor.execute(
+                f"EXECUTE {name} ({placeholders})" if param_count else f"EXECUTE {name}",
+                params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The server lost it (e.g. DISCARD ALL); prepare again next time
+            prepared.discard(name)
+            raise
+
+    with _statement_lock:
+        _statement_stats[name]['executions'] += 1
+
+
+def get_statement_stats():
+    """
+    Get execution counts for registered statements.
+
+    Returns:
+        dict: name -> {'executions': int, 'prepares': int}
+    """
+    with _statement_lock:
+        return {name: dict(stats) for name, stats in _statement_stats.items()}
+
+
+_sqlite_prepared = False
+_sqlite_prepared_lock = threading.Lock()
+
+
+def _prepare_sqlite_file():
+    """Create the SQLite directory and switch it to WAL once per process."""
+    global _sqlite_prepared
+
+    if _sqlite_prepared:
+        return
+
+    with _sqlite_prepared_lock:
+        if not _sqlite_prepared:
+            # Ensure directory exists
+            db_path = get_config('DB_PATH')
+            db_file = Path(db_path)
+            db_file.parent.mkdir(parents=True, exist_ok=True)
+
+            # Enable WAL mode for better concurrency (persisted in the file)
+            conn = sqlite3.connect(db_path, timeout=30.0)
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+            finally:
+                conn.close()
+            _sqlite_prepared = True
+
 
 def get_sqlite_connection():
     """
     Get a new SQLite database connection.
+    The caller owns the handle and must close it; DataSession does this
+    automatically.
 
     Returns:
         sqlite3.Connection: Database connection object
@@ -161,19 +1022,15 @@ def get_sqlite_connection():
         Exception: If connection fails
     """
     try:
-        # Ensure directory exists
-        db_file = Path(DB_PATH)
-        db_file.parent.mkdir(parents=True, exist_ok=True)
+        _prepare_sqlite_file()
 
-        conn = sqlite3.connect(DB_PATH, timeout=30.0)
+        conn = sqlite3.connect(get_config('DB_PATH'), timeout=30.0,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
         conn.row_factory = sqlite3.Row  # Enable column access by name
 
         # Enable foreign keys
         conn.execute("PRAGMA foreign_keys = ON")
 
-        # Enable WAL mode for better concurrency
-        conn.execute("PRAGMA journal_mode = WAL")
-
         return conn
 
     except Exception as e:
@@ -181,100 +1038,329 @@ def get_sqlite_connection():
         raise
 
 
-def initialize_sql_database():
+# ============================================================================
+# SCHEMA MIGRATIONS
+# ============================================================================
+
+# Ordered (version, description, statements). Append new versions here;
+# never edit one that has already been released. A statement is either
+# portable SQL (rewritten by the dialect's translate_ddl) or a dict of
+# dialect name -> SQL for backend-specific DDL; dialects missing from the
+# dict skip that statement.
+SCHEMA_MIGRATIONS = [
+    (1, 'Employees, Projects and EmployeeProjects', [
+        '''
+        CREATE TABLE IF NOT EXISTS Employees (
+            employee_id SERIAL PRIMARY KEY,
+            first_name VARCHAR(50) NOT NULL,
+            last_name VARCHAR(50) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            hire_date DATE NOT NULL,
+            department VARCHAR(100) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS Projects (
+            project_id SERIAL PRIMARY KEY,
+            project_name VARCHAR(200) NOT NULL,
+            start_date DATE NOT NULL,
+            end_date DATE,
+            status VARCHAR(50) DEFAULT 'Planning',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS EmployeeProjects (
+            assignment_id SERIAL PRIMARY KEY,
+            employee_id INTEGER NOT NULL,
+            project_id INTEGER NOT NULL,
+            role VARCHAR(100) NOT NULL,
+            assignment_date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES Employees(employee_id) ON DELETE CASCADE,
+            FOREIGN KEY (project_id) REFERENCES Projects(project_id) ON DELETE CASCADE,
+            UNIQUE(employee_id, project_id)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_employees_email ON Employees(email)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_department ON Employees(department)",
+        "CREATE INDEX IF NOT EXISTS idx_employee_projects_employee ON EmployeeProjects(employee_id)",
+        "CREATE INDEX IF NOT EXISTS idx_employee_projects_project ON EmployeeProjects(project_id)",
+    ]),
+    (2, 'Keyset pagination indexes on Employees', [
+        # Match the (last_name, first_name, employee_id) page order, with and
+        # without a leading department filter
+        "CREATE INDEX IF NOT EXISTS idx_employees_name_keyset ON Employees(last_name, first_name, employee_id)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_department_name ON Employees(department, last_name, first_name, employee_id)",
+    ]),
+    (3, 'Trigram search index on Employees', [
+        # Must match EMPLOYEE_SEARCH_TEXT in employee_manager; SQLite
+        # searches with plain LIKE scans instead
+        {'postgresql': "CREATE EXTENSION IF NOT EXISTS pg_trgm"},
+        {'postgresql': """
+            CREATE INDEX IF NOT EXISTS idx_employees_search_trgm ON Employees
+            USING gin ((lower(first_name || ' ' || last_name || ' ' || email || ' ' || department)) gin_trgm_ops)
+        """},
+    ]),
+    (4, 'Change tracking: updated_at columns and Tombstones', [
+        '''
+        CREATE TABLE IF NOT EXISTS Tombstones (
+            table_name VARCHAR(50) NOT NULL,
+            row_id INTEGER NOT NULL,
+            deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (table_name, row_id)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON Tombstones(table_name, deleted_at)",
+
+        # PostgreSQL: existing rows take the migration time without a table
+        # rewrite; a trigger stamps rows whose values change
+        {'postgresql': "ALTER TABLE Employees ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"},
+        {'postgresql': "ALTER TABLE Projects ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP"},
+        {'postgresql': """
+            CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+            BEGIN
+                NEW.updated_at := LOCALTIMESTAMP;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """},
+        {'postgresql': """
+            CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO Tombstones (table_name, row_id)
+                VALUES (TG_TABLE_NAME, (to_jsonb(OLD) ->> TG_ARGV[0])::integer)
+                ON CONFLICT (table_name, row_id) DO UPDATE SET deleted_at = LOCALTIMESTAMP;
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+        """},
+        {'postgresql': """
+            CREATE TRIGGER employees_updated_at BEFORE UPDATE ON Employees
+            FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+            EXECUTE FUNCTION set_updated_at()
+        """},
+        {'postgresql': """
+            CREATE TRIGGER projects_updated_at BEFORE UPDATE ON Projects
+            FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+            EXECUTE FUNCTION set_updated_at()
+        """},
+        {'postgresql': """
+            CREATE TRIGGER employees_tombstone AFTER DELETE ON Employees
+            FOR EACH ROW EXECUTE FUNCTION record_tombstone('employee_id')
+        """},
+        {'postgresql': """
+            CREATE TRIGGER projects_tombstone AFTER DELETE ON Projects
+            FOR EACH ROW EXECUTE FUNCTION record_tombstone('project_id')
+        """},
+
+        # SQLite cannot add a column with a CURRENT_TIMESTAMP default, so
+        # triggers stamp inserted rows as well
+        {'sqlite': "ALTER TABLE Employees ADD COLUMN updated_at TIMESTAMP"},
+        {'sqlite': "ALTER TABLE Projects ADD COLUMN updated_at TIMESTAMP"},
+        {'sqlite': "UPDATE Employees SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)"},
+        {'sqlite': "UPDATE Projects SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)"},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS employees_updated_at_insert AFTER INSERT ON Employees
+            FOR EACH ROW WHEN NEW.updated_at IS NULL
+            BEGIN
+                UPDATE Employees SET updated_at = CURRENT_TIMESTAMP WHERE employee_id = NEW.employee_id;
+            END
+        """},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS projects_updated_at_insert AFTER INSERT ON Projects
+            FOR EACH ROW WHEN NEW.updated_at IS NULL
+            BEGIN
+                UPDATE Projects SET updated_at = CURRENT_TIMESTAMP WHERE project_id = NEW.project_id;
+            END
+        """},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS employees_updated_at AFTER UPDATE ON Employees
+            FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE Employees SET updated_at = CURRENT_TIMESTAMP WHERE employee_id = NEW.employee_id;
+            END
+        """},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS projects_updated_at AFTER UPDATE ON Projects
+            FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE Projects SET updated_at = CURRENT_TIMESTAMP WHERE project_id = NEW.project_id;
+            END
+        """},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS employees_tombstone AFTER DELETE ON Employees
+            FOR EACH ROW
+            BEGIN
+                INSERT OR REPLACE INTO Tombstones (table_name, row_id, deleted_at)
+                VALUES ('employees', OLD.employee_id, CURRENT_TIMESTAMP);
+            END
+        """},
+        {'sqlite': """
+            CREATE TRIGGER IF NOT EXISTS projects_tombstone AFTER DELETE ON Projects
+            FOR EACH ROW
+            BEGIN
+                INSERT OR REPLACE INTO Tombstones (table_name, row_id, deleted_at)
+                VALUES ('projects', OLD.project_id, CURRENT_TIMESTAMP);
+            END
+        """},
+
+        "CREATE INDEX IF NOT EXISTS idx_employees_updated_at ON Employees(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON Projects(updated_at)",
+    ]),
+    (5, 'Row version on Employees for optimistic concurrency', [
+        # Bumped by every UPDATE of an employee (version = version + 1)
+        "ALTER TABLE Employees ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    ]),
+    (6, 'Date-range indexes on Projects', [
+        # Must match PostgresDialect.period_overlaps; an open end_date is an
+        # unbounded range
+        {'postgresql': """
+            CREATE INDEX IF NOT EXISTS idx_projects_period ON Projects USING gist (
+                (daterange(start_date, CASE WHEN end_date < start_date THEN start_date ELSE end_date END, '[]'))
+            )
+        """},
+        {'sqlite': "CREATE INDEX IF NOT EXISTS idx_projects_dates ON Projects(start_date, end_date)"},
+    ]),
+    (7, 'Allocation percentage and end date on assignments', [
+        # Existing assignments count as full-time; a NULL end_date means the
+        # assignment lasts as long as its project
+        "ALTER TABLE EmployeeProjects ADD COLUMN allocation_pct INTEGER NOT NULL DEFAULT 100 CHECK (allocation_pct BETWEEN 1 AND 100)",
+        "ALTER TABLE EmployeeProjects ADD COLUMN end_date DATE",
+    ]),
+    (8, 'Keyset indexes for the other employee page orders', [
+        # See EMPLOYEE_PAGE_ORDERS in employee_manager
+        "CREATE INDEX IF NOT EXISTS idx_employees_first_name_keyset ON Employees(first_name, last_name, employee_id)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_hire_date_keyset ON Employees(hire_date, employee_id)",
+    ]),
+]
+
+# Arbitrary key for the advisory lock that serialises migrations
+# across app workers.
+_SCHEMA_LOCK_KEY = 4815162342
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def get_target_schema_version():
+    """Return the schema version this code expects."""
+    return SCHEMA_MIGRATIONS[-1][0]
+
+
+def _get_schema_version(conn):
+    """Read the recorded schema version (0 if never migrated)."""
+    dialect = get_dialect()
+    cursor = dialect.cursor(conn)
+    try:
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        version = cursor.fetchone()[0]
+        conn.commit()
+        return version
+    except Exception as e:
+        if not dialect.is_undefined_table(e):
+            raise
+        conn.rollback()
+        return 0
+    finally:
+        cursor.close()
+
+
+def migrate_sql_schema(conn):
     """
-    Initialize PostgreSQL database with required tables.
-    Creates tables only if they don't exist.
+    Apply any schema migrations newer than the recorded version.
+
+    Args:
+        conn: Connection for the configured backend (committed on success)
+
+    Returns:
+        list: Versions applied by this call
     """
-    conn = None
-    try:
-        conn = get_sql_connection()  # postgres connection
-        conn1 = get_sqlite_connection()  # sqlite connection
-        cursor = conn.cursor()
+    target = get_target_schema_version()
+    if _get_schema_version(conn) >= target:
+        return []
 
-        # Create Employees table
+    dialect = get_dialect()
+    applied = []
+    cursor = dialect.cursor(conn)
+    try:
+        # Another worker may be migrating; wait for it, then re-check
+        dialect.begin_schema_migration(cursor, _SCHEMA_LOCK_KEY)
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Employees (
-                employee_id SERIAL PRIMARY KEY,
-                first_name VARCHAR(50) NOT NULL,
-                last_name VARCHAR(50) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                hire_date DATE NOT NULL,
-                department VARCHAR(100) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description VARCHAR(200) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        current = cursor.fetchone()[0]
+
+        for version, description, statements in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in statements:
+                if isinstance(statement, dict):
+                    statement = statement.get(dialect.name)
+                    if statement is None:
+                        continue
+                    cursor.execute(statement)
+                else:
+                    cursor.execute(dialect.translate_ddl(statement))
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (version, description))
+            applied.append(version)
 
-        # Create Projects table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Projects (
-                project_id SERIAL PRIMARY KEY,
-                project_name VARCHAR(200) NOT NULL,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                status VARCHAR(50) DEFAULT 'Planning',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        conn.commit()
+        return applied
 
-        # Create EmployeeProjects junction table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS EmployeeProjects (
-                assignment_id SERIAL PRIMARY KEY,
-                employee_id INTEGER NOT NULL,
-                project_id INTEGER NOT NULL,
-                role VARCHAR(100) NOT NULL,
-                assignment_date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (employee_id) REFERENCES Employees(employee_id) ON DELETE CASCADE,
-                FOREIGN KEY (project_id) REFERENCES Projects(project_id) ON DELETE CASCADE,
-                UNIQUE(employee_id, project_id)
-            )
-        ''')
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
 
-        # Create indexes for better performance
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_employees_email 
-            ON Employees(email)
-        ''')
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_employees_department 
-            ON Employees(department)
-        ''')
+def _ensure_sql_schema(conn):
+    """Run pending migrations the first time this process uses the SQL backend."""
+    global _schema_ready
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_employee_projects_employee 
-            ON EmployeeProjects(employee_id)
-        ''')
+    if _schema_ready:
+        return
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_employee_projects_project 
-            ON EmployeeProjects(project_id)
-        ''')
+    with _schema_lock:
+        if not _schema_ready:
+            migrate_sql_schema(conn)
+            _schema_ready = True
 
-        conn.commit()
-        print("✓ PostgreSQL database initialized successfully")
 
-        # Check tables
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        """)
-        tables = cursor.fetchall()
-        print(f"  Tables: {[t[0] for t in tables]}")
+def ensure_sql_schema():
+    """Make sure this process has checked (and if needed applied) migrations."""
+    if not _schema_ready:
+        with sql_connection():
+            pass
+
+
+def initialize_sql_database():
+    """
+    Initialize the SQL database (PostgreSQL or SQLite) with required tables.
+    Applies pending schema migrations and reports the resulting version.
+    """
+    try:
+        with sql_connection() as conn:
+            applied = migrate_sql_schema(conn)
+            if applied:
+                print(f"✓ SQL schema migrated to version {applied[-1]}")
+            else:
+                print(f"✓ SQL schema up to date "
+                      f"(version {get_target_schema_version()})")
 
     except Exception as e:
         print(f"✗ Error initializing PostgreSQL database: {e}")
-        if conn:
-            conn.rollback()
         raise
 
-    finally:
-        if conn:
-            cursor.close()
-
 
 # ============================================================================
 # MONGODB FUNCTIONS
@@ -282,37 +1368,126 @@ def initialize_sql_database():
 _mongo_client = None
 _mongo_lock = threading.Lock()
 
+# Indexes each collection needs, keyed by collection name.
+# Each entry is (keys, create_index options).
+MONGO_INDEXES = {
+    'reviews': [
+        ([('employee_id', ASCENDING)], {}),
+        ([('review_date', DESCENDING)], {}),
+    ],
+    # Reviews of offboarded employees (see offboarding.py)
+    'reviews_archive': [
+        ([('employee_id', ASCENDING)], {}),
+    ],
+}
+
+# Collection handles whose indexes have been ensured in this process.
+# Reads go through a plain dict lookup; the lock is only taken on a miss.
+_mongo_collections = {}
+
+
+def register_mongo_index(collection_name, keys, **options):
+    """
+    Declare an index that get_mongo_db_collection() must ensure.
 
-def get_mongo_db_collection():
-    """Get MongoDB collection (singleton client)."""
+    Args:
+        collection_name (str): Collection the index belongs to
+        keys (list): (field, direction) pairs as accepted by create_index
+        **options: Extra create_index options (unique, name, ...)
+    """
+    with _mongo_lock:
+        MONGO_INDEXES.setdefault(collection_name, []).append((list(keys), options))
+        # Force the next lookup to verify the new index
+        _mongo_collections.pop(collection_name, None)
+
+
+def _get_mongo_client():
+    """Create the MongoDB client on first use (caller holds _mongo_lock)."""
     global _mongo_client
 
-    with _mongo_lock:
-        if _mongo_client is None:
+    if _mongo_client is None:
+        def connect():
+            client = MongoClient(
+                get_config('MONGO_URI'),
+                serverSelectionTimeoutMS=10000,
+                connectTimeoutMS=10000,
+                socketTimeoutMS=10000
+            )
             try:
-                _mongo_client = MongoClient(
-                    MONGO_URI,
-                    serverSelectionTimeoutMS=10000,
-                    connectTimeoutMS=10000,
-                    socketTimeoutMS=10000
-                )
                 # Test connection
-                _mongo_client.admin.command('ping')
-                print("✓ MongoDB connection successful")
-            except Exception as e:
-                print(f"✗ MongoDB connection failed: {e}")
+                client.admin.command('ping')
+            except Exception:
+                client.close()
                 raise
+            return client
+
+        try:
+            _mongo_client = call_with_retry('mongo', connect, (ConnectionFailure,))
+            print("✓ MongoDB connection successful")
+        except Exception as e:
+            print(f"✗ MongoDB connection failed: {e}")
+            raise
+    return _mongo_client
+
+
+def missing_mongo_indexes(collection_name, index_information):
+    """
+    Compare declared indexes with the ones a collection already has.
+
+    Args:
+        collection_name (str): Collection name
+        index_information (dict): Result of Collection.index_information()
+
+    Returns:
+        list: (keys, options) entries that still need to be created
+    """
+    existing = {
+        tuple((field, int(direction)) if isinstance(direction, (int, float))
+              else (field, direction) for field, direction in info['key'])
+        for info in index_information.values()
+    }
+    return [(keys, options)
+            for keys, options in MONGO_INDEXES.get(collection_name, [])
+            if tuple(keys) not in existing]
 
-        db = _mongo_client[MONGO_DB_NAME]
-        collection = db['reviews']
 
-        # Create indexes
+def _ensure_mongo_indexes(collection):
+    """Create the declared indexes that the collection does not have yet."""
+    for keys, options in missing_mongo_indexes(collection.name,
+                                               collection.index_information()):
+        collection.create_index(keys, **options)
+
+
+def get_mongo_db_collection(name='reviews'):
+    """
+    Get a MongoDB collection (singleton client).
+    Declared indexes are verified once per process; after that the cached
+    handle is returned without locking.
+
+    Args:
+        name (str): Collection name
+
+    Returns:
+        pymongo.collection.Collection: The collection
+    """
+    collection = _mongo_collections.get(name)
+    if collection is not None:
+        return collection
+
+    with _mongo_lock:
+        collection = _mongo_collections.get(name)
+        if collection is not None:
+            return collection
+
+        client = _get_mongo_client()
+        collection = client[get_config('MONGO_DB_NAME')][name]
+
         try:
-            collection.create_index("employee_id")
-            collection.create_index([("review_date", -1)])
-        except:
-            pass
+            _ensure_mongo_indexes(collection)
+        except Exception as e:
+            print(f"Warning: could not ensure indexes on '{name}': {e}")
 
+        _mongo_collections[name] = collection
         return collection
 
 
@@ -332,20 +1507,284 @@ def test_mongo_connection():
         return False, f"MongoDB connection failed: {str(e)}"
 
 
+# ============================================================================
+# DATA SESSIONS
+# ============================================================================
+
+_current_session = contextvars.ContextVar('data_session', default=None)
+_open_handles = {'postgres': 0, 'postgres_read': 0, 'sqlite': 0, 'mongo': 0}
+_open_handles_lock = threading.Lock()
+
+
+def _track_handle(backend, delta):
+    with _open_handles_lock:
+        _open_handles[backend] += delta
+
+
+def get_open_handle_counts():
+    """
+    Get the number of handles currently held by DataSessions.
+
+    Returns:
+        dict: Open handle count per backend ('postgres', 'postgres_read',
+        'sqlite', 'mongo')
+    """
+    with _open_handles_lock:
+        return dict(_open_handles)
+
+
+class DataSession:
+    """
+    Scope for one logical operation across the SQL and MongoDB backends.
+
+    Backends are opened on first access and released when the outermost
+    session exits; the PostgreSQL transaction is rolled back if the block
+    raised and was not committed. A session entered while another is active
+    in the same thread or task joins it, so nested manager calls share one
+    connection per backend.
+
+    Read-only sessions take their SQL connection from the read replica
+    (see get_sql_connection), unless the enclosing session already holds a
+    primary connection, so reads inside a write flow see its own writes.
+
+    With identity_map=True the outermost session also remembers records
+    returned by the batch lookups (get_employees_by_ids and friends), so a
+    request that resolves the same IDs repeatedly queries them once.
+
+    Usage:
+        with DataSession() as session:
+            cursor = session.sql.cursor()
+            cursor.execute("SELECT 1")
+
+    Args:
+        readonly (bool): Allow SQL reads to be served by the replica
+        identity_map (bool): Cache looked-up records for the session's
+            lifetime (only honoured on the outermost session)
+    """
+
+    def __init__(self, readonly=False, identity_map=False):
+        self.readonly = readonly
+        self._root = None
+        self._token = None
+        self._handles = {}
+        self._wrote = False
+        self._identities = {} if identity_map else None
+
+    def __enter__(self):
+        outer = _current_session.get()
+        self._root = outer._root if outer is not None else self
+        self._token = _current_session.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_session.reset(self._token)
+        self._token = None
+        if self._root is self:
+            self.close(rollback=exc_type is not None)
+        return False
+
+    @property
+    def dialect(self):
+        """SQL dialect of the configured backend."""
+        return get_dialect()
+
+    def cursor(self):
+        """Open a cursor on the SQL connection that accepts PostgreSQL-style SQL."""
+        return self.dialect.cursor(self.sql)
+
+    @property
+    def sql(self):
+        """SQL connection for this session (pooled PostgreSQL or SQLite)."""
+        root = self._active_root()
+        if self.dialect.name == 'sqlite':
+            return self._open('sqlite', ensure_schema=True)
+
+        if self.readonly and 'postgres' not in root._handles:
+            return self._open('postgres_read')
+
+        if not self.readonly:
+            root._wrote = True
+        return self._open('postgres')
+
+    @property
+    def sqlite(self):
+        """SQLite connection for this session."""
+        return self._open('sqlite')
+
+    @property
+    def mongo(self):
+        """MongoDB reviews collection for this session."""
+        return self._open('mongo')
+
+    @property
+    def identity_map(self):
+        """Records cached by key for this session, or None when disabled."""
+        return self._active_root()._identities
+
+    def forget(self, record_type, key):
+        """Drop a record from the identity map after it was changed."""
+        identities = self.identity_map
+        if identities is not None:
+            identities.pop((record_type, key), None)
+
+    def _active_root(self):
+        if self._root is None:
+            raise RuntimeError("DataSession must be used as a context manager")
+        return self._root
+
+    def _open(self, backend, ensure_schema=False):
+        handles = self._active_root()._handles
+        if backend not in handles:
+            if backend == 'postgres':
+                handle = get_sql_connection()
+            elif backend == 'postgres_read':
+                handle = get_sql_connection(readonly=True)
+            elif backend == 'sqlite':
+                handle = get_sqlite_connection()
+            else:
+                handle = get_mongo_db_collection()
+            handles[backend] = handle
+            _track_handle(backend, 1)
+
+        if ensure_schema:
+            _ensure_sql_schema(handles[backend])
+        return handles[backend]
+
+    def close(self, rollback=False):
+        """Release every handle opened by this session."""
+        handles, self._handles = self._handles, {}
+        if self._identities is not None:
+            self._identities.clear()
+
+        if self._wrote and not rollback:
+            note_primary_write()
+        self._wrote = False
+
+        for backend, handle in handles.items():
+            try:
+                if backend in ('postgres', 'postgres_read'):
+                    if rollback and not handle.closed:
+                        handle.rollback()
+                    release_sql_connection(handle)
+                elif backend == 'sqlite':
+                    if rollback:
+                        handle.rollback()
+                    handle.close()
+            except Exception as e:
+                print(f"Error closing {backend} handle: {e}")
+            finally:
+                _track_handle(backend, -1)
+
+
+def fetch_records_by_ids(session, record_type, table, key_column, ids):
+    """
+    Look up many rows by primary key with one query per chunk of IDs.
+
+    IDs found in the session's identity map are not queried again, and
+    fetched records are added to it.
+
+    Args:
+        session (DataSession): Active session
+        record_type: records.Record subclass selected from the table
+        table (str): Table name
+        key_column (str): Primary key column, one of record_type.FIELDS
+        ids: Iterable of integer keys; duplicates are ignored
+
+    Returns:
+        dict: key -> record for every ID that exists
+    """
+    found = {}
+    identities = session.identity_map
+    missing = []
+    for key in dict.fromkeys(int(value) for value in ids):
+        cached = identities.get((record_type, key)) if identities is not None else None
+        if cached is not None:
+            found[key] = cached
+        else:
+            missing.append(key)
+
+    if not missing:
+        return found
+
+    dialect = session.dialect
+    cursor = session.cursor()
+    chunk_size = dialect.max_list_params
+    key_index = record_type.FIELDS.index(key_column)
+
+    for start in range(0, len(missing), chunk_size):
+        condition, params = dialect.in_condition(
+            key_column, missing[start:start + chunk_size])
+        cursor.execute(
+            f"SELECT {record_type.COLUMNS} FROM {table} WHERE {condition}", params)
+        for row in cursor.fetchall():
+            record = record_type(row)
+            found[row[key_index]] = record
+            if identities is not None:
+                identities[(record_type, row[key_index])] = record
+
+    return found
+
+
+# How far back each "changed since" result's as_of is set, so rows stamped
+# by transactions that were still in flight during one poll are picked up
+# by the next (at the cost of re-reading this window)
+CHANGE_POLL_OVERLAP = timedelta(seconds=60)
+
+
+def fetch_changes_since(session, record_type, table, since):
+    """
+    Read the rows of a table changed or deleted after a point in time.
+
+    Args:
+        session (DataSession): Active session
+        record_type: records.Record subclass selected from the table
+        table (str): Table name (tracked by the schema version 4 triggers)
+        since (datetime): Previous result's as_of; None for everything
+
+    Returns:
+        dict: changed (records, oldest change first), deleted (list of
+        IDs) and as_of (datetime to pass as `since` next time)
+    """
+    dialect = session.dialect
+    cursor = session.cursor()
+    as_of = dialect.current_timestamp(cursor) - CHANGE_POLL_OVERLAP
+
+    if since is None:
+        cursor.execute(
+            f"SELECT {record_type.COLUMNS} FROM {table} ORDER BY updated_at")
+        return {'changed': build_records(record_type, cursor.fetchall()),
+                'deleted': [], 'as_of': as_of}
+
+    cursor.execute(
+        f"SELECT {record_type.COLUMNS} FROM {table} WHERE updated_at > %s ORDER BY updated_at",
+        (since,))
+    changed = build_records(record_type, cursor.fetchall())
+
+    cursor.execute(
+        "SELECT row_id FROM Tombstones WHERE table_name = %s AND deleted_at > %s",
+        (table.lower(), since))
+    deleted = [row_id for (row_id,) in cursor.fetchall()]
+
+    return {'changed': changed, 'deleted': deleted, 'as_of': as_of}
+
+
 # ============================================================================
 # INITIALIZATION
 # ============================================================================
 
-def initialize_databases():
+def bootstrap():
     """
-    Initialize both SQL and NoSQL databases.
-    Called on application startup.
+    Explicitly prepare both SQL and NoSQL databases.
+    Applies pending PostgreSQL migrations and checks MongoDB connectivity.
+    Importing this module no longer does this; normal requests migrate
+    lazily on first use, so bootstrap() is for deploy scripts and the CLI.
     """
     print("\n" + "="*60)
     print("INITIALIZING DATABASES")
     print("="*60)
+    print(f"  SQLite Path: {get_config('DB_PATH')}")
+    print(f"  MongoDB Database: {get_config('MONGO_DB_NAME')}")
 
-    # Initialize SQLite
     try:
         initialize_sql_database()
     except Exception as e:
@@ -369,13 +1808,9 @@ def initialize_databases():
     print("="*60 + "\n")
 
 
-# ============================================================================
-# AUTO-INITIALIZE ON IMPORT
-# ============================================================================
+# Kept for callers that used the old startup hook
+initialize_databases = bootstrap
+
 
-# Initialize databases when module is imported
-try:
-    initialize_databases()
-except Exception as e:
-    print(f"Warning: Database initialization had issues: {e}")
-    print("Some features may not work correctly")
+if __name__ == '__main__':
+    bootstrap()
@@ -0,0 +1,314 @@
+"""
+dialects.py
+
+SQL dialect differences between PostgreSQL and SQLite.
+
+Manager modules write their SQL once, PostgreSQL-style (%s placeholders,
+RETURNING, ON CONFLICT), and run it through the active dialect. The SQLite
+dialect rewrites placeholders and DDL and maps date columns to Python
+date/datetime objects, so the same managers can run against an embedded
+database for single-node deployments and local benchmarks.
+"""
+
+import re
+import sqlite3
+from datetime import date, datetime
+
+import psycopg2.errors
+import psycopg2.extras
+
+
+class PostgresDialect:
+    """PostgreSQL: SQL passes through unchanged."""
+
+    name = 'postgresql'
+    placeholder = '%s'
+    # Data-modifying statements (INSERT/UPDATE/DELETE) inside WITH
+    supports_dml_cte = True
+    # Largest list bound into one statement by in_condition()
+    max_list_params = 10000
+    distinct_operator = 'IS DISTINCT FROM'
+
+    def translate(self, sql):
+        """Rewrite a statement for this dialect."""
+        return sql
+
+    def translate_ddl(self, sql):
+        """Rewrite a DDL statement for this dialect."""
+        return sql
+
+    def cursor(self, conn):
+        """Open a cursor that accepts PostgreSQL-style SQL."""
+        return conn.cursor()
+
+    def server_cursor(self, conn, name, itersize):
+        """Open a cursor that keeps its result set on the server."""
+        cursor = conn.cursor(name=name)
+        cursor.itersize = itersize
+        return cursor
+
+    def in_condition(self, column, values):
+        """
+        Build a membership test against a list of values.
+
+        Returns:
+            tuple: (SQL condition, parameters)
+        """
+        # One array parameter, so the statement text is the same for any count
+        return f"{column} = ANY(%s)", [list(values)]
+
+    def period_overlaps(self, start_column, end_column, start, end):
+        """
+        Build a test for a date period overlapping [start, end].
+
+        The period runs from start_column to end_column inclusive; a NULL
+        end_column means it is still open.
+
+        Returns:
+            tuple: (SQL condition, parameters)
+        """
+        # Same expression as idx_projects_period (schema version 6), so the
+        # GiST index serves the && test. An end before the start is read as
+        # a one-day period rather than raising a range error
+        period = (f"daterange({start_column}, CASE WHEN {end_column} < {start_column} "
+                  f"THEN {start_column} ELSE {end_column} END, '[]')")
+        return f"{period} && daterange(%s, %s, '[]')", [start, end]
+
+    def on_conflict(self, conflict_columns, update_columns=None, table=None,
+                    extra_assignments=None):
+        """
+        Build an upsert clause.
+
+        Args:
+            conflict_columns (list): Columns of the unique constraint
+            update_columns (list): Columns to overwrite from the new row;
+                DO NOTHING when omitted
+            table (str): Target table; when given, existing rows whose
+                update columns already hold the new values are left
+                untouched (no new row version is written)
+            extra_assignments (list): Further SET items applied with the
+                update, e.g. "version = Employees.version + 1"
+
+        Returns:
+            str: ON CONFLICT clause
+        """
+        target = ', '.join(conflict_columns)
+        if not update_columns:
+            return f"ON CONFLICT ({target}) DO NOTHING"
+        assignments = ', '.join(
+            [f"{col} = excluded.{col}" for col in update_columns]
+            + list(extra_assignments or []))
+        clause = f"ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+        if table:
+            changed = ' OR '.join(
+                f"{table}.{col} {self.distinct_operator} excluded.{col}"
+                for col in update_columns)
+            clause += f" WHERE {changed}"
+        return clause
+
+    def execute_values(self, cursor, sql, rows, page_size=1000, fetch=False,
+                       template=None):
+        """
+        Run a statement with a multi-row VALUES list, one page at a time.
+
+        Args:
+            cursor: Cursor from this dialect
+            sql (str): Statement whose only placeholder is the %s standing
+                for the VALUES list
+            rows (list): Parameter tuples, all the same length
+            page_size (int): Rows per statement
+            fetch (bool): Collect and return the rows each page returns
+            template (str): PostgreSQL row template, e.g. to cast columns
+                that may be all NULL; ignored by SQLite
+
+        Returns:
+            list: Returned rows when fetch is True
+        """
+        return psycopg2.extras.execute_values(
+            cursor, sql, rows, template=template, page_size=page_size,
+            fetch=fetch)
+
+    def values_source(self, alias, columns):
+        """
+        Build a FROM item naming the columns of a VALUES list.
+
+        Args:
+            alias (str): Name of the derived table
+            columns (list): Column names, in row order
+
+        Returns:
+            str: SQL with a single %s standing for the VALUES list
+        """
+        return f"(VALUES %s) AS {alias} ({', '.join(columns)})"
+
+    def adapt_date(self, value):
+        """Convert a date/datetime/ISO string parameter for this backend."""
+        if isinstance(value, str):
+            return date.fromisoformat(value.strip())
+        return value
+
+    def current_timestamp(self, cursor):
+        """Read the database clock as stored in TIMESTAMP columns."""
+        cursor.execute("SELECT LOCALTIMESTAMP")
+        return cursor.fetchone()[0]
+
+    def begin_schema_migration(self, cursor, lock_key):
+        """Serialise schema migrations across processes."""
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", (lock_key,))
+
+    def is_undefined_table(self, exc):
+        return isinstance(exc, psycopg2.errors.UndefinedTable)
+
+    def is_foreign_key_violation(self, exc):
+        return isinstance(exc, psycopg2.errors.ForeignKeyViolation)
+
+    def is_unique_violation(self, exc):
+        return isinstance(exc, psycopg2.errors.UniqueViolation)
+
+
+class SQLiteCursor:
+    """sqlite3 cursor wrapper that accepts PostgreSQL-style SQL."""
+
+    def __init__(self, cursor, dialect):
+        self._cursor = cursor
+        self._dialect = dialect
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(self._dialect.translate(sql), params or ())
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(self._dialect.translate(sql), seq_of_params)
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+        return False
+
+
+_SQLITE_PARAM = re.compile(r"%\((\w+)\)s|%s|%%")
+
+
+def _convert_date(value):
+    try:
+        return date.fromisoformat(value.decode())
+    except ValueError:
+        # Legacy rows written in other formats stay as text
+        return value.decode()
+
+
+def _convert_timestamp(value):
+    try:
+        return datetime.fromisoformat(value.decode())
+    except ValueError:
+        return value.decode()
+
+
+class SQLiteDialect(PostgresDialect):
+    """SQLite 3.35+: placeholders and DDL are rewritten on the fly."""
+
+    name = 'sqlite'
+    placeholder = '?'
+    supports_dml_cte = False
+    # Below the 999 host-parameter limit of older SQLite builds
+    max_list_params = 900
+    distinct_operator = 'IS NOT'
+
+    def translate(self, sql):
+        def replace(match):
+            if match.group(1):
+                return f":{match.group(1)}"
+            return '?' if match.group(0) == '%s' else '%'
+        return _SQLITE_PARAM.sub(replace, sql)
+
+    def translate_ddl(self, sql):
+        sql = re.sub(r"\bSERIAL PRIMARY KEY\b",
+                     "INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.IGNORECASE)
+        return self.translate(sql)
+
+    def cursor(self, conn):
+        return SQLiteCursor(conn.cursor(), self)
+
+    def in_condition(self, column, values):
+        values = list(values)
+        return f"{column} IN ({', '.join(['%s'] * len(values))})", values
+
+    def period_overlaps(self, start_column, end_column, start, end):
+        # Served by the (start_date, end_date) index on Projects
+        return (f"{start_column} <= %s AND ({end_column} IS NULL "
+                f"OR max({start_column}, {end_column}) >= %s)", [end, start])
+
+    def execute_values(self, cursor, sql, rows, page_size=1000, fetch=False,
+                       template=None):
+        rows = list(rows)
+        if not rows:
+            return [] if fetch else None
+        width = len(rows[0])
+        page_size = max(1, min(page_size, self.max_list_params // width))
+        row_sql = '(' + ', '.join(['%s'] * width) + ')'
+
+        results = []
+        for start in range(0, len(rows), page_size):
+            page = rows[start:start + page_size]
+            cursor.execute(
+                sql.replace('%s', ', '.join([row_sql] * len(page)), 1),
+                [value for row in page for value in row])
+            if fetch:
+                results.extend(cursor.fetchall())
+        return results if fetch else None
+
+    def values_source(self, alias, columns):
+        # VALUES columns are called column1, column2, ... and cannot be
+        # renamed in the alias
+        renamed = ', '.join(
+            f"column{position} AS {name}" for position, name in enumerate(columns, 1))
+        return f"(SELECT {renamed} FROM (VALUES %s)) AS {alias}"
+
+    def server_cursor(self, conn, name, itersize):
+        # sqlite3 already steps through results lazily
+        return self.cursor(conn)
+
+    def adapt_date(self, value):
+        value = super().adapt_date(value)
+        return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+    def current_timestamp(self, cursor):
+        # CURRENT_TIMESTAMP is UTC text, as written by column defaults
+        cursor.execute("SELECT CURRENT_TIMESTAMP")
+        return datetime.fromisoformat(cursor.fetchone()[0])
+
+    def begin_schema_migration(self, cursor, lock_key):
+        # Takes the database write lock until commit
+        cursor.execute("BEGIN IMMEDIATE")
+
+    def is_undefined_table(self, exc):
+        return isinstance(exc, sqlite3.OperationalError) and 'no such table' in str(exc)
+
+    def is_foreign_key_violation(self, exc):
+        return isinstance(exc, sqlite3.IntegrityError) and 'FOREIGN KEY' in str(exc)
+
+    def is_unique_violation(self, exc):
+        return isinstance(exc, sqlite3.IntegrityError) and 'UNIQUE' in str(exc)
+
+
+# Store dates as ISO text and read DATE/TIMESTAMP columns back as objects,
+# matching what psycopg2 returns
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('TIMESTAMP', _convert_timestamp)
+
+
+DIALECTS = {
+    'postgresql': PostgresDialect(),
+    'sqlite': SQLiteDialect(),
+}
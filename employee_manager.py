@@ -1,183 +1,822 @@
-from db_connections import get_sqlite_connection, get_sql_connection
+import csv
+import io
+from collections.abc import Mapping
+from datetime import date, datetime
+
+from db_connections import (
+    DataSession, execute_statement, fetch_changes_since, fetch_records_by_ids,
+    get_dialect, register_statement, stream_query)
+from outcomes import BulkResult, SyncResult, WriteOutcome
+from records import Employee, build_columns, build_records
+
+
+EMPLOYEE_BY_ID = register_statement(
+    'employee_by_id',
+    f"SELECT {Employee.COLUMNS} FROM Employees WHERE employee_id=%s")
+
+_ALL_EMPLOYEES_SQL = (
+    f"SELECT {Employee.COLUMNS} FROM Employees ORDER BY last_name, first_name")
 
 
 def add_employee(first_name, last_name, email, hire_date, department):
     """Add a new employee to the database."""
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO Employees (first_name, last_name, email, hire_date, department) 
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING employee_id
-            """, (first_name, last_name, email, hire_date, department))
-        result = cursor.fetchone()
-        conn.commit()
-        return result[0] if result else None
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            cursor.execute("""
+                INSERT INTO Employees (first_name, last_name, email, hire_date, department) 
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING employee_id
+                """, (first_name, last_name, email, hire_date, department))
+            result = cursor.fetchone()
+            conn.commit()
+            return result[0] if result else None
 
     except Exception as e:
         print(f"Error adding employee: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if conn:
-            conn.close()
 
 
-def get_employee_by_id(employee_id):
+def get_employee_by_id(employee_id, use_primary=False):
     """Retrieve a single employee by ID."""
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
 
-        cursor.execute(
-            "SELECT * FROM Employees WHERE employee_id=%s", (employee_id,))
-        row = cursor.fetchone()
+            execute_statement(cursor, EMPLOYEE_BY_ID, (employee_id,))
+            row = cursor.fetchone()
+            return Employee(row) if row else None
 
-        if row:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
+    except Exception as e:
+        print(f"Error getting employee: {e}")
         return None
 
+
+def get_employees_by_ids(employee_ids, use_primary=False):
+    """
+    Retrieve many employees by ID in one round trip.
+
+    Inside a DataSession(identity_map=True), employees already looked up in
+    that session are returned without querying again.
+
+    Args:
+        employee_ids: Iterable of employee IDs
+
+    Returns:
+        dict: employee_id -> Employee for every ID that exists
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            return fetch_records_by_ids(
+                session, Employee, 'Employees', 'employee_id', employee_ids)
+
     except Exception as e:
-        print(f"Error getting employee: {e}")
+        print(f"Error getting employees: {e}")
+        return {}
+
+
+def get_employees_changed_since(since, use_primary=False):
+    """
+    Retrieve employees added, changed or deleted after a point in time.
+
+    Usage:
+        delta = get_employees_changed_since(None)          # full load
+        delta = get_employees_changed_since(delta['as_of'])  # later polls
+
+    Consecutive polls overlap slightly, so a row may be reported twice.
+
+    Args:
+        since (datetime): as_of from the previous call; None for all rows
+
+    Returns:
+        dict: changed (Employee records), deleted (employee IDs) and as_of;
+        None on error
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            return fetch_changes_since(session, Employee, 'Employees', since)
+
+    except Exception as e:
+        print(f"Error getting changed employees: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 
-def list_all_employees():
-    """Retrieve all employees from the database."""
-    conn = None
+def list_all_employees(use_primary=False, columnar=False):
+    """
+    Retrieve all employees from the database.
+
+    Returns:
+        list: Employee records, or with columnar=True a dict of column
+        lists for pd.DataFrame()
+    """
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
 
-        cursor.execute(
-            "SELECT * FROM Employees ORDER BY last_name, first_name")
+            cursor.execute(_ALL_EMPLOYEES_SQL)
+            rows = cursor.fetchall()
 
-        columns = [description[0] for description in cursor.description]
-        employees = []
+            if columnar:
+                return build_columns(Employee, rows)
+            return build_records(Employee, rows)
 
-        for row in cursor.fetchall():
-            employees.append(dict(zip(columns, row)))
+    except Exception as e:
+        print(f"Error listing employees: {e}")
+        return {} if columnar else []
 
-        return employees
+
+def iter_all_employees(itersize=None, use_primary=False):
+    """
+    Iterate over all employees without loading them into memory at once.
+
+    Args:
+        itersize (int): Rows fetched per round trip; defaults to
+            DB_STREAM_ITERSIZE
+
+    Yields:
+        Employee: One record per row, in list_all_employees() order
+    """
+    return stream_query(_ALL_EMPLOYEES_SQL, itersize=itersize,
+                        readonly=not use_primary, record=Employee)
+
+
+def _like_prefix(text):
+    """Escape LIKE wildcards in user input and append a trailing %."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _employee_filters(department=None, hired_from=None, hired_to=None, name_prefix=None):
+    """Build the WHERE conditions and parameters shared by the paged queries."""
+    conditions = []
+    params = []
+
+    if department:
+        departments = [department] if isinstance(department, str) else list(department)
+        conditions.append(
+            f"department IN ({', '.join(['%s'] * len(departments))})")
+        params.extend(departments)
+    if hired_from:
+        conditions.append("hire_date >= %s")
+        params.append(hired_from)
+    if hired_to:
+        conditions.append("hire_date <= %s")
+        params.append(hired_to)
+    if name_prefix:
+        pattern = _like_prefix(name_prefix.strip().lower())
+        conditions.append(
+            "(lower(last_name) LIKE %s ESCAPE '\\' OR lower(first_name) LIKE %s ESCAPE '\\')")
+        params.extend([pattern, pattern])
+
+    return conditions, params
+
+
+# Sort orders of list_employees_page -> keyset columns, each ending in the
+# unique employee_id and backed by an index (schema versions 2 and 8)
+EMPLOYEE_PAGE_ORDERS = {
+    'employee_id': ('employee_id',),
+    'first_name': ('first_name', 'last_name', 'employee_id'),
+    'last_name': ('last_name', 'first_name', 'employee_id'),
+    'hire_date': ('hire_date', 'employee_id'),
+    'department': ('department', 'last_name', 'first_name', 'employee_id'),
+}
+
+
+def list_employees_page(after=None, limit=50, department=None, hired_from=None,
+                        hired_to=None, name_prefix=None, include_total=False,
+                        order_by='last_name', use_primary=False):
+    """
+    Retrieve one page of employees in a stable sort order.
+
+    Pages are keyset-based: pass the previous page's next_cursor as `after`
+    to continue, so each page reads only its own rows however deep it is.
+
+    Args:
+        after (tuple): next_cursor of the previous page (the sort columns of
+            the last row already seen); None for the first page
+        limit (int): Page size
+        department (str or list): Only these department(s)
+        hired_from (date): Earliest hire date, inclusive
+        hired_to (date): Latest hire date, inclusive
+        name_prefix (str): Case-insensitive prefix of the first or last name
+        include_total (bool): Also count all rows matching the filters
+        order_by (str): Key of EMPLOYEE_PAGE_ORDERS; the cursor of one order
+            cannot be used with another
+
+    Returns:
+        dict: employees (list of Employee records), next_cursor (tuple, None on the last page)
+        and total (int, None unless requested)
+    """
+    page = {'employees': [], 'next_cursor': None, 'total': None}
+    keyset = EMPLOYEE_PAGE_ORDERS[order_by]
+    conditions, params = _employee_filters(
+        department, hired_from, hired_to, name_prefix)
+
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            if include_total:
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f"SELECT COUNT(*) FROM Employees {where}", params)
+                page['total'] = cursor.fetchone()[0]
+
+            if after is not None:
+                conditions = conditions + [
+                    f"({', '.join(keyset)}) > ({', '.join(['%s'] * len(keyset))})"]
+                params = params + list(after)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            # Fetch one extra row to learn whether another page follows
+            cursor.execute(f"""
+                SELECT {Employee.COLUMNS} FROM Employees
+                {where}
+                ORDER BY {', '.join(keyset)}
+                LIMIT %s
+            """, params + [limit + 1])
+
+            employees = build_records(Employee, cursor.fetchall())
+
+            if len(employees) > limit:
+                employees = employees[:limit]
+                last = employees[-1]
+                page['next_cursor'] = tuple(last[column] for column in keyset)
+            page['employees'] = employees
+            return page
 
     except Exception as e:
         print(f"Error listing employees: {e}")
+        return page
+
+
+def list_departments(use_primary=False):
+    """Retrieve the distinct departments that have employees."""
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            cursor.execute(
+                "SELECT DISTINCT department FROM Employees ORDER BY department")
+            return [row[0] for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"Error listing departments: {e}")
+        return []
+
+
+# Indexed by idx_employees_search_trgm (schema version 3)
+EMPLOYEE_SEARCH_TEXT = (
+    "lower(first_name || ' ' || last_name || ' ' || email || ' ' || department)")
+
+SEARCH_LIMIT_MAX = 100
+
+
+def search_employees(term, limit=20, use_primary=False):
+    """
+    Search employees by name, email or department.
+
+    On PostgreSQL matches come from the trigram index: besides substring
+    matches, words similar to the term above pg_trgm's
+    word_similarity_threshold are found. Names and emails starting with the
+    term rank first, then results by similarity.
+
+    Args:
+        term (str): Text to look for (case-insensitive)
+        limit (int): Maximum results, capped at SEARCH_LIMIT_MAX
+
+    Returns:
+        list: Employee records, best match first
+    """
+    term = (term or '').strip().lower()
+    if not term:
+        return []
+    limit = max(1, min(int(limit), SEARCH_LIMIT_MAX))
+    prefix = _like_prefix(term)
+    contains = '%' + prefix
+
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            prefix_rank = """
+                CASE WHEN lower(first_name) LIKE %s ESCAPE '\\'
+                       OR lower(last_name) LIKE %s ESCAPE '\\'
+                       OR lower(email) LIKE %s ESCAPE '\\'
+                     THEN 0 ELSE 1 END
+            """
+            if session.dialect.name == 'postgresql':
+                cursor.execute(f"""
+                    SELECT {Employee.COLUMNS} FROM Employees
+                    WHERE {EMPLOYEE_SEARCH_TEXT} LIKE %s ESCAPE '\\'
+                       OR %s <%% {EMPLOYEE_SEARCH_TEXT}
+                    ORDER BY {prefix_rank},
+                             word_similarity(%s, {EMPLOYEE_SEARCH_TEXT}) DESC,
+                             last_name, first_name, employee_id
+                    LIMIT %s
+                """, (contains, term, prefix, prefix, prefix, term, limit))
+            else:
+                cursor.execute(f"""
+                    SELECT {Employee.COLUMNS} FROM Employees
+                    WHERE {EMPLOYEE_SEARCH_TEXT} LIKE %s ESCAPE '\\'
+                    ORDER BY {prefix_rank}, last_name, first_name, employee_id
+                    LIMIT %s
+                """, (contains, prefix, prefix, prefix, limit))
+
+            return build_records(Employee, cursor.fetchall())
+
+    except Exception as e:
+        print(f"Error searching employees: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
 
 def update_employee(employee_id, first_name, last_name, email, hire_date, department):
     """Update an existing employee's information."""
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
 
-        cursor.execute("""
-            UPDATE Employees 
-            SET first_name=%s, last_name=%s, email=%s, hire_date=%s, department=%s
-            WHERE employee_id=%s
-        """, (first_name, last_name, email, hire_date, department, employee_id))
+            cursor.execute("""
+                UPDATE Employees 
+                SET first_name=%s, last_name=%s, email=%s, hire_date=%s, department=%s,
+                    version = version + 1
+                WHERE employee_id=%s
+            """, (first_name, last_name, email, hire_date, department, employee_id))
 
-        conn.commit()
-        return cursor.rowcount > 0
+            conn.commit()
+            session.forget(Employee, employee_id)
+            return cursor.rowcount > 0
 
     except Exception as e:
         print(f"Error updating employee: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if conn:
-            conn.close()
 
 
 def delete_employee(employee_id):
-    """Delete an employee if they have no project assignments."""
-    conn = None
+    """
+    Delete an employee if they have no project assignments.
+
+    Returns:
+        WriteOutcome: DELETED, BLOCKED if the employee has assignments,
+        NOT_FOUND or FAILED on error
+    """
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            if session.dialect.supports_dml_cte:
+                # Check and delete in a single statement; the outer SELECT
+                # sees the table as it was before the DELETE ran
+                cursor.execute("""
+                    WITH deleted AS (
+                        DELETE FROM Employees e
+                        WHERE e.employee_id = %s
+                          AND NOT EXISTS (
+                              SELECT 1 FROM EmployeeProjects ep
+                              WHERE ep.employee_id = e.employee_id
+                          )
+                        RETURNING employee_id
+                    )
+                    SELECT
+                        EXISTS (SELECT 1 FROM deleted),
+                        EXISTS (SELECT 1 FROM Employees WHERE employee_id = %s)
+                """, (employee_id, employee_id))
+                was_deleted, existed = cursor.fetchone()
+            else:
+                # Embedded backends have no round trips to save
+                cursor.execute("""
+                    DELETE FROM Employees
+                    WHERE employee_id = %s
+                      AND NOT EXISTS (
+                          SELECT 1 FROM EmployeeProjects ep
+                          WHERE ep.employee_id = Employees.employee_id
+                      )
+                """, (employee_id,))
+                was_deleted = cursor.rowcount > 0
+                cursor.execute(
+                    "SELECT EXISTS (SELECT 1 FROM Employees WHERE employee_id = %s)",
+                    (employee_id,))
+                existed = was_deleted or bool(cursor.fetchone()[0])
+            conn.commit()
+            session.forget(Employee, employee_id)
+
+            if was_deleted:
+                return WriteOutcome(WriteOutcome.DELETED, employee_id)
+            if existed:
+                print("Cannot delete: Employee has project assignments")
+                return WriteOutcome(
+                    WriteOutcome.BLOCKED, employee_id,
+                    reason="Employee has project assignments")
+            return WriteOutcome(
+                WriteOutcome.NOT_FOUND, employee_id,
+                reason="Employee not found")
+
+    except Exception as e:
+        print(f"Error deleting employee: {e}")
+        return WriteOutcome(WriteOutcome.FAILED, employee_id, reason=str(e))
+
+
+EMPLOYEE_FIELDS = ('first_name', 'last_name', 'email', 'hire_date', 'department')
+
+# Column widths from the Employees table
+_EMPLOYEE_FIELD_LIMITS = {
+    'first_name': 50, 'last_name': 50, 'email': 100, 'department': 100}
+
+
+def _clean_employee_record(record):
+    """
+    Validate one bulk-import record.
+
+    Returns:
+        tuple: Values in EMPLOYEE_FIELDS order
 
-        # Check for project assignments
-        cursor.execute("""
-            SELECT COUNT(*) FROM EmployeeProjects 
-            WHERE employee_id=%s
-        """, (employee_id,))
+    Raises:
+        ValueError: With the reason the record was rejected
+    """
+    if isinstance(record, Mapping):
+        values = [record.get(field) for field in EMPLOYEE_FIELDS]
+    else:
+        values = list(record)
+        if len(values) != len(EMPLOYEE_FIELDS):
+            raise ValueError(
+                f"expected {len(EMPLOYEE_FIELDS)} fields, got {len(values)}")
+
+    return tuple(_clean_employee_value(field, value)
+                 for field, value in zip(EMPLOYEE_FIELDS, values))
+
+
+def _clean_employee_value(field, value):
+    """Validate and normalise one employee field; raises ValueError."""
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == '':
+        raise ValueError(f"missing {field}")
+
+    if field == 'hire_date':
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"bad hire_date {value!r}") from None
+
+    value = str(value)
+    if len(value) > _EMPLOYEE_FIELD_LIMITS[field]:
+        raise ValueError(
+            f"{field} longer than {_EMPLOYEE_FIELD_LIMITS[field]} characters")
+    if field == 'email' and '@' not in value:
+        raise ValueError(f"bad email {value!r}")
+    return value
+
+
+class _CopyStream:
+    """Read-only file object that renders CSV lines lazily for COPY FROM STDIN."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out, lineterminator='\n')
+        self._pending = ''
+
+    def _fill(self, size):
+        # Render rows until at least `size` characters are buffered
+        chunks = [self._pending]
+        buffered = len(self._pending)
+        for row in self._rows:
+            self._writer.writerow(row)
+            chunk = self._out.getvalue()
+            self._out.seek(0)
+            self._out.truncate()
+            chunks.append(chunk)
+            buffered += len(chunk)
+            if 0 <= size <= buffered:
+                break
+        self._pending = ''.join(chunks)
+
+    def read(self, size=-1):
+        if size is None or size < 0 or len(self._pending) < size:
+            self._fill(-1 if size is None else size)
+        if size is None or size < 0:
+            data, self._pending = self._pending, ''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def readline(self, size=-1):
+        if '\n' not in self._pending:
+            self._fill(len(self._pending) + 1)
+        end = self._pending.find('\n') + 1 or len(self._pending)
+        data, self._pending = self._pending[:end], self._pending[end:]
+        return data
+
+
+def bulk_add_employees(employees):
+    """
+    Add many employees in a single transaction.
 
-        if cursor.fetchone()[0] > 0:
-            print("Cannot delete: Employee has project assignments")
-            return False
+    Records are validated as they are read. On PostgreSQL the valid ones are
+    streamed into a temporary staging table with COPY FROM STDIN and merged
+    into Employees with one INSERT ... SELECT, so the input is never held in
+    memory and the whole import costs a handful of round trips.
 
-        # Safe to delete
-        cursor.execute(
-            "DELETE FROM Employees WHERE employee_id=%s", (employee_id,))
-        conn.commit()
+    Args:
+        employees: Iterable of dicts keyed by EMPLOYEE_FIELDS, or tuples in
+            that order (e.g. rows from csv.reader)
 
-        return cursor.rowcount > 0
+    Returns:
+        BulkResult: IDs keyed by input position, plus rejected positions with
+        reasons (missing fields, bad dates, duplicate emails)
+    """
+    result = BulkResult()
+    # email -> input position of every row handed to the database
+    accepted = {}
+
+    def valid_rows():
+        for position, record in enumerate(employees):
+            try:
+                row = _clean_employee_record(record)
+            except ValueError as e:
+                result.rejected.append((position, str(e)))
+                continue
+            if row[2] in accepted:
+                result.rejected.append(
+                    (position, f"duplicate email {row[2]!r} in input"))
+                continue
+            accepted[row[2]] = position
+            yield (position,) + row
+
+    try:
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            if session.dialect.name == 'postgresql':
+                cursor.execute("""
+                    CREATE TEMP TABLE employee_staging (
+                        row_index INTEGER NOT NULL,
+                        first_name TEXT,
+                        last_name TEXT,
+                        email TEXT,
+                        hire_date DATE,
+                        department TEXT
+                    ) ON COMMIT DROP
+                """)
+                cursor.copy_expert(
+                    "COPY employee_staging FROM STDIN WITH (FORMAT csv)",
+                    _CopyStream(valid_rows()))
+                # ORDER BY keeps the assigned IDs in input order
+                cursor.execute("""
+                    INSERT INTO Employees (first_name, last_name, email, hire_date, department)
+                    SELECT first_name, last_name, email, hire_date, department
+                    FROM employee_staging
+                    ORDER BY row_index
+                    ON CONFLICT (email) DO NOTHING
+                    RETURNING employee_id, email
+                """)
+                for employee_id, email in cursor.fetchall():
+                    result.inserted[accepted[email]] = employee_id
+            else:
+                # Embedded backends have no round trips to save
+                for position, *row in valid_rows():
+                    cursor.execute("""
+                        INSERT INTO Employees (first_name, last_name, email, hire_date, department)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (email) DO NOTHING
+                        RETURNING employee_id
+                    """, row)
+                    inserted = cursor.fetchone()
+                    if inserted:
+                        result.inserted[position] = inserted[0]
+            conn.commit()
 
     except Exception as e:
-        print(f"Error deleting employee: {e}")
-        if conn:
-            conn.rollback()
-        return False
-    finally:
-        if conn:
-            conn.close()
+        print(f"Error bulk adding employees: {e}")
+        result.inserted.clear()
+        result.rejected.extend(
+            (position, f"not written: {e}") for position in accepted.values())
+        result.rejected.sort()
+        return result
+
+    for email, position in accepted.items():
+        if position not in result.inserted:
+            result.rejected.append((position, f"email {email!r} already exists"))
+    result.rejected.sort()
+    return result
+
+
+def sync_employees(employees, batch_size=1000):
     """
-    Delete an employee if they have no project assignments.
-    
+    Create or update employees keyed by email, e.g. from a nightly HR export.
+
+    Rows are upserted in batches with INSERT ... ON CONFLICT (email) DO
+    UPDATE. Existing rows whose values already match are skipped by the
+    conflict clause, so an unchanged resync writes no new row versions. The
+    whole sync runs in one transaction.
+
     Args:
-        employee_id (int): ID of employee to delete
-    
+        employees: Iterable of dicts keyed by EMPLOYEE_FIELDS, or tuples in
+            that order
+        batch_size (int): Rows per upsert statement
+
     Returns:
-        bool: True if deleted, False if employee has assignments or error
+        SyncResult: Inserted, updated and unchanged counts, plus rejected
+        input positions with reasons
     """
+    result = SyncResult()
+    update_columns = [field for field in EMPLOYEE_FIELDS if field != 'email']
+    accepted = []
+    seen = set()
+
+    def flush(session, cursor, batch):
+        dialect = session.dialect
+        upsert = f"""
+            INSERT INTO Employees ({', '.join(EMPLOYEE_FIELDS)})
+            VALUES %s
+            {dialect.on_conflict(['email'], update_columns, table='Employees',
+                                 extra_assignments=['version = Employees.version + 1'])}
+        """
+        if dialect.name == 'postgresql':
+            # xmax is 0 only on row versions created by the INSERT itself
+            returned = dialect.execute_values(
+                cursor, upsert + " RETURNING (xmax = 0)", batch,
+                page_size=batch_size, fetch=True)
+            inserted = sum(1 for (is_new,) in returned if is_new)
+        else:
+            emails = [row[2] for row in batch]
+            existing = set()
+            for start in range(0, len(emails), dialect.max_list_params):
+                condition, params = dialect.in_condition(
+                    'email', emails[start:start + dialect.max_list_params])
+                cursor.execute(f"SELECT email FROM Employees WHERE {condition}", params)
+                existing.update(email for (email,) in cursor.fetchall())
+            returned = dialect.execute_values(
+                cursor, upsert + " RETURNING email", batch,
+                page_size=batch_size, fetch=True)
+            inserted = sum(1 for (email,) in returned if email not in existing)
+
+        result.inserted += inserted
+        result.updated += len(returned) - inserted
+        result.unchanged += len(batch) - len(returned)
+
     try:
-        from db_connections import get_sql_connection
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            batch = []
+            for position, record in enumerate(employees):
+                try:
+                    row = _clean_employee_record(record)
+                except ValueError as e:
+                    result.rejected.append((position, str(e)))
+                    continue
+                # A single statement may not update the same row twice
+                if row[2] in seen:
+                    result.rejected.append(
+                        (position, f"duplicate email {row[2]!r} in input"))
+                    continue
+                seen.add(row[2])
+                accepted.append(position)
+                batch.append(row)
+
+                if len(batch) >= batch_size:
+                    flush(session, cursor, batch)
+                    batch = []
+            if batch:
+                flush(session, cursor, batch)
+
+            conn.commit()
+            return result
+
+    except Exception as e:
+        print(f"Error syncing employees: {e}")
+        result.inserted = result.updated = result.unchanged = 0
+        result.rejected.extend(
+            (position, f"not written: {e}") for position in accepted)
+        result.rejected.sort()
+        return result
 
-        conn = get_sql_connection()
-        cursor = conn.cursor()
 
-        # Check for project assignments
-        cursor.execute("""
-            SELECT COUNT(*) FROM EmployeeProjects 
-            WHERE employee_id=%s
-        """, (employee_id,))
+def batch_update_employees(changes, atomic=False):
+    """
+    Apply many employee edits in one transaction, with optimistic locking.
 
-        assignment_count = cursor.fetchone()[0]
+    Each change carries the employee_id, the version the row was read at
+    and the fields to change; fields left out (or None) keep their value.
+    All valid edits go through a single UPDATE ... FROM (VALUES ...), which
+    only touches rows still at the expected version, so an edit made by
+    someone else in the meantime is reported instead of overwritten.
 
-        if assignment_count > 0:
-            print(
-                f"Cannot delete: Employee has {assignment_count} project assignment(s)")
-            return False
+    Args:
+        changes: Iterable of dicts with employee_id, version and any of
+            EMPLOYEE_FIELDS
+        atomic (bool): Apply nothing unless every change can be applied
 
-        # Safe to delete
-        cursor.execute(
-            "DELETE FROM Employees WHERE employee_id=%s", (employee_id,))
-        conn.commit()
+    Returns:
+        list: One WriteOutcome per change, in input order: UPDATED,
+        CONFLICT, NOT_FOUND or FAILED
+    """
+    changes = list(changes)
+    outcomes = [None] * len(changes)
+    positions = {}
+    rows = []
+
+    for position, change in enumerate(changes):
+        try:
+            employee_id = int(change['employee_id'])
+            version = int(change['version'])
+        except (KeyError, TypeError, ValueError):
+            outcomes[position] = WriteOutcome(
+                WriteOutcome.FAILED, reason="employee_id and version are required")
+            continue
+        if employee_id in positions:
+            outcomes[position] = WriteOutcome(
+                WriteOutcome.FAILED, employee_id,
+                reason="employee changed twice in one batch")
+            continue
+        try:
+            values = [
+                _clean_employee_value(field, change[field])
+                if change.get(field) is not None else None
+                for field in EMPLOYEE_FIELDS
+            ]
+        except ValueError as e:
+            outcomes[position] = WriteOutcome(
+                WriteOutcome.FAILED, employee_id, reason=str(e))
+            continue
+        positions[employee_id] = position
+        rows.append((employee_id, version, *values))
+
+    def fail_pending(reason):
+        for employee_id, position in positions.items():
+            if outcomes[position] is None or outcomes[position]:
+                outcomes[position] = WriteOutcome(
+                    WriteOutcome.FAILED, employee_id, reason=reason)
+
+    invalid = any(outcome is not None for outcome in outcomes)
+    if not rows or (atomic and invalid):
+        fail_pending("batch not applied: other changes are invalid")
+        return outcomes
 
-        return cursor.rowcount > 0
+    try:
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+            dialect = session.dialect
+
+            # Key columns are renamed so RETURNING employee_id is unambiguous
+            columns = ('target_id', 'expected_version') + EMPLOYEE_FIELDS
+            assignments = ', '.join(
+                f"{field} = COALESCE(v.{field}, e.{field})" for field in EMPLOYEE_FIELDS)
+            updated = dialect.execute_values(cursor, f"""
+                UPDATE Employees AS e
+                SET {assignments}, version = e.version + 1
+                FROM {dialect.values_source('v', columns)}
+                WHERE e.employee_id = v.target_id
+                  AND e.version = v.expected_version
+                RETURNING employee_id
+            """, rows, fetch=True,
+                template="(%s::integer, %s::integer, %s, %s, %s, %s::date, %s)")
+
+            for (employee_id,) in updated:
+                outcomes[positions[employee_id]] = WriteOutcome(
+                    WriteOutcome.UPDATED, employee_id)
+                session.forget(Employee, employee_id)
+
+            # Tell apart rows edited by someone else from deleted ones
+            stale = [employee_id for employee_id, position in positions.items()
+                     if outcomes[position] is None]
+            if stale:
+                condition, params = dialect.in_condition('employee_id', stale)
+                cursor.execute(
+                    f"SELECT employee_id, version FROM Employees WHERE {condition}", params)
+                current = dict(cursor.fetchall())
+                for employee_id in stale:
+                    if employee_id in current:
+                        outcome = WriteOutcome(
+                            WriteOutcome.CONFLICT, employee_id,
+                            reason=f"changed by someone else (now version {current[employee_id]})")
+                    else:
+                        outcome = WriteOutcome(
+                            WriteOutcome.NOT_FOUND, employee_id, reason="Employee not found")
+                    outcomes[positions[employee_id]] = outcome
+
+            if atomic and stale:
+                conn.rollback()
+                fail_pending("batch not applied: other changes conflict")
+                return outcomes
+
+            conn.commit()
+            return outcomes
 
     except Exception as e:
-        print(f"Error deleting employee: {e}")
-        return False
-    finally:
-        if conn:
-            conn.close()
+        print(f"Error updating employees: {e}")
+        if get_dialect().is_unique_violation(e):
+            fail_pending("batch not applied: an email is already in use")
+        else:
+            fail_pending(f"batch not applied: {e}")
+        return outcomes
@@ -3,24 +3,7 @@ from employee_manager import add_employee, get_employee_by_id
 from project_manager import add_project, assign_employee_to_project, get_projects_for_employee
 from performance_reviewer import submit_performance_review, get_performance_reviews_for_employee
 from reports import generate_employee_project_report, generate_employee_performance_summary
-from db_connections import get_sqlite_connection, get_mongo_db_collection, get_sql_connection
-
-
-def get_conn():
-    conn = get_sql_connection()
-    conn1 = get_sqlite_connection()
-    if conn is None:
-        return None
-    else:
-        return conn
-
-
-def get_mongodb_reviews():
-    reviews_collection = get_mongo_db_collection()
-    if reviews_collection is None:
-        return None
-    else:
-        return reviews_collection
+from db_connections import start_keep_warm
 
 
 def get_review_input(employee_id):
@@ -67,7 +50,6 @@ def get_review_input(employee_id):
 
 
 def handle_add_employee():
-    conn = get_conn()
     print("\n--- Add New Employee ---")
     first_name = input("First Name: ")
     last_name = input("Last Name: ")
@@ -75,7 +57,7 @@ def handle_add_employee():
     hire_date = input("Date of Hiring (YYYY-MM-DD): ")
     department = input("Department: ")
 
-    rowid = add_employee(conn, first_name, last_name,
+    rowid = add_employee(first_name, last_name,
                          email, hire_date, department)
     if rowid is not None:
         print(f"\nEmployee Added successfully. Employee ID: {rowid}")
@@ -84,14 +66,13 @@ def handle_add_employee():
 
 
 def handle_add_project():
-    conn = get_conn()
     print("\n--- Add New Project ---")
     project_name = input("Project Name: ")
     start_date = input("Start Date (YYYY-MM-DD): ")
     end_date = input("End Date (YYYY-MM-DD): ")
     status = input("Status (Planning, Development, Completion): ")
 
-    rowid = add_project(conn, project_name, start_date,
+    rowid = add_project(project_name, start_date,
                         end_date if end_date else None, status)
     if rowid is not None:
         print(f"\nProject Added successfully. Project ID: {rowid}")
@@ -100,29 +81,26 @@ def handle_add_project():
 
 
 def handle_assign_project():
-    conn = get_conn()
     print("\n--- Assign Employee to Project ---")
     employee_id = int(input("Enter Employee ID: "))
     project_id = input("Enter Project ID: ")
     role = input("Enter the role for the project: ")
 
-    if get_employee_by_id(conn, employee_id) is None:
+    if get_employee_by_id(employee_id) is None:
         print(f"\nError: Employee with ID {employee_id} not found.")
         return
 
-    if assign_employee_to_project(conn, employee_id, project_id, role):
+    if assign_employee_to_project(employee_id, project_id, role):
         print(f"\nEmployee {employee_id} assigned to project {project_id}.")
     else:
         print("\nAssignment failed (Check IDs or foreign key constraints).")
 
 
 def handle_submit_review():
-    conn = get_conn()
-    reviews = get_mongodb_reviews()
     print("\n--- Submit Performance Review ---")
     employee_id = int(input("Enter Employee ID for review: "))
 
-    if get_employee_by_id(conn, employee_id) is None:
+    if get_employee_by_id(employee_id) is None:
         print(
             f"\nError: Employee with ID {employee_id} not found in the system.")
         return
@@ -142,7 +120,6 @@ def handle_submit_review():
         }
 
         inserted_id = submit_performance_review(
-            reviews,
             **submit_args,
             **review_data
         )
@@ -153,15 +130,14 @@ def handle_submit_review():
 
 
 def handle_view_projects():
-    conn = get_conn()
     print("\n--- View Employee Projects ---")
     employee_id = int(input("Enter Employee ID: "))
 
-    if get_employee_by_id(conn, employee_id) is None:
+    if get_employee_by_id(employee_id) is None:
         print(f"\nError: Employee with ID {employee_id} not found.")
         return
 
-    result = get_projects_for_employee(conn, employee_id)
+    result = get_projects_for_employee(employee_id)
     if result:
         print(f"\nProjects for Employee {employee_id}:")
         for project in result:
@@ -173,17 +149,15 @@ def handle_view_projects():
 
 
 def handle_view_performance():
-    conn = get_conn()
-    reviews = get_mongodb_reviews()
     print("\n--- View Employee Performance Reviews ---")
     employee_id = int(input("Enter Employee ID: "))
 
-    if get_employee_by_id(conn, employee_id) is None:
+    if get_employee_by_id(employee_id) is None:
         print(f"\nError: Employee with ID {employee_id} not found.")
         return
 
     emp_performance = get_performance_reviews_for_employee(
-        reviews, employee_id)
+        employee_id)
     if emp_performance:
         print(f"\nPerformance Reviews for Employee {employee_id}:")
         for review in emp_performance:
@@ -197,20 +171,18 @@ def handle_view_performance():
 
 
 def handle_reports():
-    conn = get_conn()
-    reviews = get_mongodb_reviews()
     print("\n--- Generate Reports ---")
     print("\n[Project Report]")
-    generate_employee_project_report(conn)
+    generate_employee_project_report()
 
     print("\n[Performance Summary]")
     employee_id = int(
         input("Enter Employee ID for performance summary (e.g., 1): "))
-    if get_employee_by_id(conn, employee_id) is None:
+    if get_employee_by_id(employee_id) is None:
         print(
             f"\nError: Employee with ID {employee_id} not found for report generation.")
     else:
-        generate_employee_performance_summary(conn, reviews, employee_id)
+        generate_employee_performance_summary(employee_id)
 
 
 def display_menu():
@@ -229,6 +201,9 @@ def display_menu():
 
 
 def main():
+    # Connect in the background while the user reads the menu
+    start_keep_warm()
+
     menu_actions = {
         1: handle_add_employee,
         2: handle_add_project,
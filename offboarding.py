@@ -0,0 +1,107 @@
+"""
+offboarding.py
+
+Bulk removal of departed employees across PostgreSQL and MongoDB.
+
+Employees are processed in batches. For each batch the review documents
+are copied to the reviews_archive collection with one bulk write, the
+employees' assignments and rows are removed in one SQL transaction, and
+only then are the reviews dropped from the live collection. Every step is
+idempotent, so a run that stops part-way (crash, deploy, failed batch) is
+resumed by passing the same IDs again: finished employees come back as
+not_found and any reviews left behind are archived on the way.
+"""
+
+from datetime import datetime
+
+from pymongo import ReplaceOne
+
+from db_connections import DataSession, get_mongo_db_collection
+from outcomes import OffboardResult
+
+
+ARCHIVE_COLLECTION = 'reviews_archive'
+
+
+def offboard_employees(employee_ids, batch_size=500, progress=None):
+    """
+    Remove employees together with their assignments and archive their reviews.
+
+    Args:
+        employee_ids: Iterable of employee IDs; duplicates are ignored
+        batch_size (int): Employees per SQL transaction and Mongo bulk write
+        progress: Optional callable(done, total) invoked after each batch
+
+    Returns:
+        OffboardResult: Offboarded, missing and failed IDs plus counts of
+        ended assignments and archived reviews
+    """
+    ids = list(dict.fromkeys(int(value) for value in employee_ids))
+    result = OffboardResult()
+
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        try:
+            _offboard_batch(batch, result)
+        except Exception as e:
+            print(f"Error offboarding employees {batch[0]}..{batch[-1]}: {e}")
+            result.failed.extend((employee_id, str(e)) for employee_id in batch)
+
+        if progress is not None:
+            progress(start + len(batch), len(ids))
+
+    return result
+
+
+def _offboard_batch(batch, result):
+    """Archive reviews, then remove one batch of employees."""
+    with DataSession() as session:
+        reviews = session.mongo
+        archived = _archive_reviews(reviews, batch)
+
+        conn = session.sql
+        dialect = session.dialect
+        cursor = session.cursor()
+        # Chunk the IN lists for backends with a low parameter limit
+        chunk_size = dialect.max_list_params
+        ended = 0
+        removed = set()
+        for chunk_start in range(0, len(batch), chunk_size):
+            condition, params = dialect.in_condition(
+                'employee_id', batch[chunk_start:chunk_start + chunk_size])
+            cursor.execute(f"DELETE FROM EmployeeProjects WHERE {condition}", params)
+            ended += cursor.rowcount
+            cursor.execute(
+                f"DELETE FROM Employees WHERE {condition} RETURNING employee_id",
+                params)
+            removed.update(employee_id for (employee_id,) in cursor.fetchall())
+        conn.commit()
+
+        # Only drop the live copies once the SQL rows are gone
+        reviews.delete_many({'employee_id': {'$in': batch}})
+
+    result.assignments_ended += ended
+    result.reviews_archived += archived
+    for employee_id in batch:
+        if employee_id in removed:
+            result.offboarded.append(employee_id)
+        else:
+            result.not_found.append(employee_id)
+
+
+def _archive_reviews(reviews, batch):
+    """Copy a batch's reviews to the archive collection; return how many."""
+    documents = list(reviews.find({'employee_id': {'$in': batch}}))
+    if not documents:
+        return 0
+
+    offboarded_at = datetime.now()
+    # Upsert by _id so re-running an interrupted batch does not duplicate
+    requests = [
+        ReplaceOne({'_id': document['_id']},
+                   {**document, 'offboarded_at': offboarded_at},
+                   upsert=True)
+        for document in documents
+    ]
+    get_mongo_db_collection(ARCHIVE_COLLECTION).bulk_write(requests, ordered=False)
+    return len(documents)
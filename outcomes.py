@@ -0,0 +1,132 @@
+"""
+outcomes.py
+
+Result objects returned by the write operations in the manager modules.
+"""
+
+
+class WriteOutcome:
+    """
+    Result of a single-row write.
+
+    Truthy only when the row was actually written, so callers that treated
+    the old True/False return values as booleans keep working.
+
+    Attributes:
+        status (str): One of the status constants below
+        row_id: ID of the affected row, when there is one
+        reason (str): Human-readable explanation for non-written outcomes
+    """
+
+    INSERTED = 'inserted'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    EXISTS = 'exists'
+    BLOCKED = 'blocked'
+    NOT_FOUND = 'not_found'
+    CONFLICT = 'conflict'
+    FAILED = 'failed'
+
+    __slots__ = ('status', 'row_id', 'reason')
+
+    def __init__(self, status, row_id=None, reason=None):
+        self.status = status
+        self.row_id = row_id
+        self.reason = reason
+
+    def __bool__(self):
+        return self.status in (self.INSERTED, self.UPDATED, self.DELETED)
+
+    def __eq__(self, other):
+        if isinstance(other, WriteOutcome):
+            return (self.status, self.row_id) == (other.status, other.row_id)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.status, self.row_id))
+
+    def __repr__(self):
+        return f"WriteOutcome({self.status!r}, row_id={self.row_id!r}, reason={self.reason!r})"
+
+
+class BulkResult:
+    """
+    Result of a bulk write.
+
+    Attributes:
+        inserted (dict): Input position -> ID of the row written for it
+        rejected (list): (input position, reason) for each row not written
+    """
+
+    __slots__ = ('inserted', 'rejected')
+
+    def __init__(self, inserted=None, rejected=None):
+        self.inserted = inserted if inserted is not None else {}
+        self.rejected = rejected if rejected is not None else []
+
+    @property
+    def inserted_ids(self):
+        """IDs of the written rows, in input order."""
+        return [self.inserted[position] for position in sorted(self.inserted)]
+
+    def __len__(self):
+        return len(self.inserted)
+
+    def __repr__(self):
+        return f"BulkResult(inserted={len(self.inserted)}, rejected={len(self.rejected)})"
+
+
+class SyncResult:
+    """
+    Result of an upsert-style sync.
+
+    Attributes:
+        inserted (int): Rows created
+        updated (int): Existing rows whose values changed
+        unchanged (int): Existing rows already up to date
+        rejected (list): (input position, reason) for each invalid row
+    """
+
+    __slots__ = ('inserted', 'updated', 'unchanged', 'rejected')
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.rejected = []
+
+    def __repr__(self):
+        return (f"SyncResult(inserted={self.inserted}, updated={self.updated}, "
+                f"unchanged={self.unchanged}, rejected={len(self.rejected)})")
+
+
+class OffboardResult:
+    """
+    Result of a bulk offboarding run.
+
+    Attributes:
+        offboarded (list): IDs of the employees removed by this run
+        not_found (list): IDs that no longer existed (e.g. removed by an
+            earlier, interrupted run); their reviews are still archived
+        assignments_ended (int): Project assignments removed
+        reviews_archived (int): Review documents moved to the archive
+        failed (list): (employee ID, reason) for each ID whose batch failed;
+            pass them to the job again to retry
+    """
+
+    __slots__ = ('offboarded', 'not_found', 'assignments_ended',
+                 'reviews_archived', 'failed')
+
+    def __init__(self):
+        self.offboarded = []
+        self.not_found = []
+        self.assignments_ended = 0
+        self.reviews_archived = 0
+        self.failed = []
+
+    def __repr__(self):
+        return (f"OffboardResult(offboarded={len(self.offboarded)}, "
+                f"not_found={len(self.not_found)}, "
+                f"assignments_ended={self.assignments_ended}, "
+                f"reviews_archived={self.reviews_archived}, "
+                f"failed={len(self.failed)})")
@@ -1,28 +1,30 @@
 from datetime import datetime
-from db_connections import get_mongo_db_collection
+from db_connections import DataSession
 
 
 def submit_performance_review(employee_id, review_date, reviewer_name,
                               overall_rating, strengths=None,
                               areas_for_improvement=None, comments="",
-                              goals_for_next_period=None):
+                              goals_for_next_period=None, **extra_fields):
     """Submit a performance review for an employee."""
     try:
-        collection = get_mongo_db_collection()
-
-        review_document = {
-            "employee_id": employee_id,
-            "review_date": review_date,
-            "reviewer_name": reviewer_name,
-            "overall_rating": overall_rating,
-            "strengths": strengths if strengths else [],
-            "areas_for_improvement": areas_for_improvement if areas_for_improvement else [],
-            "comments": comments,
-            "goals_for_next_period": goals_for_next_period if goals_for_next_period else []
-        }
-
-        result = collection.insert_one(review_document)
-        return result.inserted_id
+        with DataSession() as session:
+            collection = session.mongo
+
+            review_document = {
+                "employee_id": employee_id,
+                "review_date": review_date,
+                "reviewer_name": reviewer_name,
+                "overall_rating": overall_rating,
+                "strengths": strengths if strengths else [],
+                "areas_for_improvement": areas_for_improvement if areas_for_improvement else [],
+                "comments": comments,
+                "goals_for_next_period": goals_for_next_period if goals_for_next_period else []
+            }
+            review_document.update(extra_fields)
+
+            result = collection.insert_one(review_document)
+            return result.inserted_id
 
     except Exception as e:
         print(f"Error submitting review: {e}")
@@ -32,11 +34,10 @@ def submit_performance_review(employee_id, review_date, reviewer_name,
 def get_performance_reviews_for_employee(employee_id):
     """Get all performance reviews for a specific employee."""
     try:
-        collection = get_mongo_db_collection()
-
-        reviews = list(collection.find(
-            {"employee_id": employee_id}
-        ).sort("review_date", -1))
+        with DataSession() as session:
+            reviews = list(session.mongo.find(
+                {"employee_id": employee_id}
+            ).sort("review_date", -1))
 
         # Convert ObjectId to string for JSON serialization
         for review in reviews:
@@ -1,194 +1,662 @@
-from db_connections import get_sqlite_connection, get_sql_connection
+from db_connections import (
+    DataSession, execute_statement, fetch_changes_since, fetch_records_by_ids,
+    get_dialect, register_statement, stream_query)
+from outcomes import WriteOutcome
+from records import (
+    Employee, Project, ProjectAssignment, ProjectMember, build_columns, build_records)
+
+
+_ALL_PROJECTS_SQL = f"SELECT {Project.COLUMNS} FROM Projects ORDER BY project_name"
+
+PROJECTS_FOR_EMPLOYEE = register_statement('projects_for_employee', """
+    SELECT 
+        p.project_id,
+        p.project_name,
+        p.start_date,
+        p.end_date,
+        p.status,
+        ep.role,
+        ep.assignment_date,
+        ep.allocation_pct,
+        ep.end_date AS assignment_end_date
+    FROM Projects p
+    INNER JOIN EmployeeProjects ep ON p.project_id = ep.project_id
+    WHERE ep.employee_id = %s
+    ORDER BY p.project_name
+""")
+
+INSERT_ASSIGNMENT = register_statement('insert_assignment', """
+    INSERT INTO EmployeeProjects (employee_id, project_id, role, assignment_date,
+                                  allocation_pct, end_date)
+    VALUES (%s, %s, %s, CURRENT_DATE, %s, %s)
+    ON CONFLICT (employee_id, project_id) DO NOTHING
+    RETURNING assignment_id
+""")
 
 
 def add_project(project_name, start_date, end_date=None, status='Planning'):
     """Add a new project to the database."""
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO Projects (project_name, start_date, end_date, status)
-            VALUES (%s, %s, %s, %s)
-            RETURNING project_id
-            """, (project_name, start_date, end_date, status))
-        result = cursor.fetchone()
-        conn.commit()
-        return result[0] if result else None
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            cursor.execute("""
+                INSERT INTO Projects (project_name, start_date, end_date, status)
+                VALUES (%s, %s, %s, %s)
+                RETURNING project_id
+                """, (project_name, start_date, end_date, status))
+            result = cursor.fetchone()
+            conn.commit()
+            return result[0] if result else None
 
     except Exception as e:
         print(f"Error adding project: {e}")
-        if conn:
-            conn.rollback()
         return None
-    finally:
-        if conn:
-            conn.close()
-
 
-def list_all_projects():
-    """Retrieve all projects from the database."""
-    conn = None
-    try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM Projects ORDER BY project_name")
+def list_all_projects(use_primary=False, columnar=False):
+    """
+    Retrieve all projects from the database.
 
-        columns = [description[0] for description in cursor.description]
-        projects = []
+    Returns:
+        list: Project records, or with columnar=True a dict of column lists
+        for pd.DataFrame()
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
 
-        for row in cursor.fetchall():
-            projects.append(dict(zip(columns, row)))
+            cursor.execute(_ALL_PROJECTS_SQL)
+            rows = cursor.fetchall()
 
-        return projects
+            if columnar:
+                return build_columns(Project, rows)
+            return build_records(Project, rows)
 
     except Exception as e:
         print(f"Error listing projects: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+        return {} if columnar else []
 
 
-def get_project_by_id(project_id):
+def iter_all_projects(itersize=None, use_primary=False):
+    """
+    Iterate over all projects without loading them into memory at once.
+
+    Args:
+        itersize (int): Rows fetched per round trip; defaults to
+            DB_STREAM_ITERSIZE
+
+    Yields:
+        Project: One record per row, in list_all_projects() order
+    """
+    return stream_query(_ALL_PROJECTS_SQL, itersize=itersize,
+                        readonly=not use_primary, record=Project)
+
+
+def get_project_by_id(project_id, use_primary=False):
     """Get a specific project by ID."""
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
 
-        cursor.execute(
-            "SELECT * FROM Projects WHERE project_id=%s", (project_id,))
-        row = cursor.fetchone()
+            cursor.execute(
+                f"SELECT {Project.COLUMNS} FROM Projects WHERE project_id=%s",
+                (project_id,))
+            row = cursor.fetchone()
+            return Project(row) if row else None
 
-        if row:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
+    except Exception as e:
+        print(f"Error getting project: {e}")
         return None
 
+
+def get_projects_by_ids(project_ids, use_primary=False):
+    """
+    Retrieve many projects by ID in one round trip.
+
+    Inside a DataSession(identity_map=True), projects already looked up in
+    that session are returned without querying again.
+
+    Args:
+        project_ids: Iterable of project IDs
+
+    Returns:
+        dict: project_id -> Project for every ID that exists
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            return fetch_records_by_ids(
+                session, Project, 'Projects', 'project_id', project_ids)
+
     except Exception as e:
-        print(f"Error getting project: {e}")
+        print(f"Error getting projects: {e}")
+        return {}
+
+
+def get_projects_changed_since(since, use_primary=False):
+    """
+    Retrieve projects added, changed or deleted after a point in time.
+    See get_employees_changed_since for usage.
+
+    Args:
+        since (datetime): as_of from the previous call; None for all rows
+
+    Returns:
+        dict: changed (Project records), deleted (project IDs) and as_of;
+        None on error
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            return fetch_changes_since(session, Project, 'Projects', since)
+
+    except Exception as e:
+        print(f"Error getting changed projects: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 
-def assign_employee_to_project(employee_id, project_id, role):
-    """Assign an employee to a project with a specific role."""
-    conn = None
+def get_projects_active_between(start, end, use_primary=False):
+    """
+    Retrieve the projects running at any point between two dates.
+
+    A project is active from its start_date through its end_date
+    (inclusive), or indefinitely when it has no end_date. Backed by a
+    date-range index, so a timeline only reads the projects in its window.
+
+    Args:
+        start (date): First day of the window
+        end (date): Last day of the window
+
+    Returns:
+        list: Project records ordered by start date
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            dialect = session.dialect
+            cursor = session.cursor()
+
+            condition, params = dialect.period_overlaps(
+                'start_date', 'end_date',
+                dialect.adapt_date(start), dialect.adapt_date(end))
+            cursor.execute(f"""
+                SELECT {Project.COLUMNS} FROM Projects
+                WHERE {condition}
+                ORDER BY start_date, project_name
+            """, params)
+            return build_records(Project, cursor.fetchall())
+
+    except Exception as e:
+        print(f"Error getting active projects: {e}")
+        return []
+
+
+def get_assignments_overlapping(employee_id, start, end, use_primary=False):
+    """
+    Retrieve an employee's assignments that overlap a date window.
+
+    An assignment runs from its assignment_date until its own end_date,
+    or the project's when it has none (open-ended if neither is set).
+
+    Args:
+        employee_id (int): Employee to look up
+        start (date): First day of the window
+        end (date): Last day of the window
+
+    Returns:
+        list: ProjectAssignment records ordered by assignment date
+    """
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
+        with DataSession(readonly=not use_primary) as session:
+            dialect = session.dialect
+            cursor = session.cursor()
+
+            condition, params = dialect.period_overlaps(
+                'ep.assignment_date', 'COALESCE(ep.end_date, p.end_date)',
+                dialect.adapt_date(start), dialect.adapt_date(end))
+            cursor.execute(f"""
+                SELECT
+                    p.project_id,
+                    p.project_name,
+                    p.start_date,
+                    p.end_date,
+                    p.status,
+                    ep.role,
+                    ep.assignment_date,
+                    ep.allocation_pct,
+                    ep.end_date AS assignment_end_date
+                FROM EmployeeProjects ep
+                INNER JOIN Projects p ON p.project_id = ep.project_id
+                WHERE ep.employee_id = %s AND {condition}
+                ORDER BY ep.assignment_date, p.project_name
+            """, [employee_id] + params)
+            return build_records(ProjectAssignment, cursor.fetchall())
+
+    except Exception as e:
+        print(f"Error getting overlapping assignments: {e}")
+        return []
+
+
+def _clean_allocation(allocation_pct=100, end_date=None):
+    """Validate an assignment's allocation and end date for the database."""
+    allocation_pct = 100 if allocation_pct is None else int(allocation_pct)
+    if not 1 <= allocation_pct <= 100:
+        raise ValueError("allocation_pct must be between 1 and 100")
+    if end_date is not None:
+        end_date = get_dialect().adapt_date(end_date)
+    return allocation_pct, end_date
 
-        # Check if assignment already exists
-        cursor.execute("""
-            SELECT COUNT(*) FROM EmployeeProjects 
-            WHERE employee_id=%s AND project_id=%s
-        """, (employee_id, project_id))
 
-        if cursor.fetchone()[0] > 0:
-            print("Employee already assigned to this project")
-            return False
+def assign_employee_to_project(employee_id, project_id, role,
+                               allocation_pct=100, end_date=None):
+    """
+    Assign an employee to a project with a specific role.
 
-        # Create assignment
-        cursor.execute("""
-            INSERT INTO EmployeeProjects (employee_id, project_id, role, assignment_date)
-            VALUES (%s, %s, %s, CURRENT_DATE)
-        """, (employee_id, project_id, role))
+    Args:
+        allocation_pct (int): Share of the employee's time, 1-100
+        end_date (date): Last day of the assignment; None to run until the
+            project ends
 
-        conn.commit()
-        return True
+    Returns:
+        WriteOutcome: INSERTED with the new assignment_id, EXISTS if the
+        employee is already on the project, BLOCKED if either ID is unknown
+        or FAILED on error
+    """
+    try:
+        allocation_pct, end_date = _clean_allocation(allocation_pct, end_date)
+    except (TypeError, ValueError) as e:
+        return WriteOutcome(WriteOutcome.FAILED, reason=str(e))
+
+    try:
+        with DataSession() as session:
+            conn = session.sql
+            cursor = session.cursor()
+
+            # One round trip: the UNIQUE(employee_id, project_id) constraint
+            # decides whether the assignment already exists
+            execute_statement(
+                cursor, INSERT_ASSIGNMENT,
+                (employee_id, project_id, role, allocation_pct, end_date))
+            row = cursor.fetchone()
+            conn.commit()
+
+            if row is None:
+                print("Employee already assigned to this project")
+                return WriteOutcome(
+                    WriteOutcome.EXISTS,
+                    reason="Employee already assigned to this project")
+            return WriteOutcome(WriteOutcome.INSERTED, row[0])
 
     except Exception as e:
+        if get_dialect().is_foreign_key_violation(e):
+            print("Cannot assign: employee or project does not exist")
+            return WriteOutcome(
+                WriteOutcome.BLOCKED,
+                reason="Employee or project does not exist")
         print(f"Error assigning employee: {e}")
-        if conn:
-            conn.rollback()
-        return False
-    finally:
-        if conn:
-            conn.close()
+        return WriteOutcome(WriteOutcome.FAILED, reason=str(e))
+
+
+def bulk_assign(assignments):
+    """
+    Assign many employees to projects in a single transaction.
+
+    Valid rows are inserted by one multi-row INSERT ... SELECT FROM (VALUES
+    ...) ON CONFLICT DO NOTHING; rows naming an unknown employee or project
+    are filtered out by the statement rather than aborting it. In the usual
+    case the whole batch costs one round trip.
+
+    Args:
+        assignments: Iterable of (employee_id, project_id, role) tuples,
+            optionally followed by allocation_pct and end_date (see
+            assign_employee_to_project)
+
+    Returns:
+        list: One WriteOutcome per input row, in input order: INSERTED with
+        the new assignment_id, EXISTS if already assigned (or repeated in
+        the input), BLOCKED if the employee or project does not exist, or
+        FAILED for invalid input and errors
+    """
+    outcomes = []
+    # (employee_id, project_id) -> input position of the row sent to the database
+    pending = {}
+    rows = []
+
+    for position, assignment in enumerate(assignments):
+        try:
+            employee_id, project_id, role, *allocation = assignment
+            key = (int(employee_id), int(project_id))
+            role = str(role).strip() if role is not None else ''
+            if not role or len(role) > 100:
+                raise ValueError("role must be 1-100 characters")
+            allocation = _clean_allocation(*allocation)
+        except (TypeError, ValueError) as e:
+            outcomes.append(WriteOutcome(WriteOutcome.FAILED, reason=str(e)))
+            continue
+
+        if key in pending:
+            outcomes.append(WriteOutcome(
+                WriteOutcome.EXISTS,
+                reason="Assignment repeated in input"))
+            continue
+        pending[key] = position
+        rows.append(key + (role,) + allocation)
+        outcomes.append(None)
+
+    if not rows:
+        return outcomes
 
+    try:
+        with DataSession() as session:
+            conn = session.sql
+            dialect = session.dialect
+            cursor = session.cursor()
+
+            source = dialect.values_source(
+                'v', ('employee_id', 'project_id', 'role', 'allocation_pct', 'end_date'))
+            # The WHERE clause also keeps SQLite's INSERT ... SELECT upsert
+            # syntax unambiguous
+            inserted = dialect.execute_values(cursor, f"""
+                INSERT INTO EmployeeProjects (employee_id, project_id, role, assignment_date,
+                                              allocation_pct, end_date)
+                SELECT v.employee_id, v.project_id, v.role, CURRENT_DATE,
+                       v.allocation_pct, v.end_date
+                FROM {source}
+                WHERE EXISTS (SELECT 1 FROM Employees e WHERE e.employee_id = v.employee_id)
+                  AND EXISTS (SELECT 1 FROM Projects p WHERE p.project_id = v.project_id)
+                ON CONFLICT (employee_id, project_id) DO NOTHING
+                RETURNING assignment_id, employee_id, project_id
+            """, rows, fetch=True, template="(%s::integer, %s::integer, %s, %s::integer, %s::date)")
+
+            for assignment_id, employee_id, project_id in inserted:
+                position = pending.pop((employee_id, project_id))
+                outcomes[position] = WriteOutcome(
+                    WriteOutcome.INSERTED, assignment_id)
+
+            # Rows left over are either already assigned or name a missing
+            # employee/project; look up which IDs exist to tell them apart
+            known_employees = _existing_ids(
+                cursor, dialect, 'Employees', 'employee_id',
+                {employee_id for employee_id, _ in pending})
+            known_projects = _existing_ids(
+                cursor, dialect, 'Projects', 'project_id',
+                {project_id for _, project_id in pending})
+            conn.commit()
 
-def get_projects_for_employee(employee_id):
+    except Exception as e:
+        print(f"Error assigning employees: {e}")
+        return [outcome if outcome is not None
+                else WriteOutcome(WriteOutcome.FAILED, reason=str(e))
+                for outcome in outcomes]
+
+    for (employee_id, project_id), position in pending.items():
+        if employee_id in known_employees and project_id in known_projects:
+            outcomes[position] = WriteOutcome(
+                WriteOutcome.EXISTS,
+                reason="Employee already assigned to this project")
+        else:
+            outcomes[position] = WriteOutcome(
+                WriteOutcome.BLOCKED,
+                reason="Employee or project does not exist")
+    return outcomes
+
+
+def assign_employees_to_project(project_id, members):
+    """
+    Staff a project in one round trip.
+
+    Args:
+        project_id (int): Project to assign to
+        members: Iterable of (employee_id, role) tuples, optionally followed
+            by allocation_pct and end_date
+
+    Returns:
+        list: One WriteOutcome per member, as for bulk_assign
+    """
+    outcomes = []
+    # (input position, bulk_assign row) for each member that could be unpacked
+    assignments = []
+    for position, member in enumerate(members):
+        try:
+            employee_id, role, *allocation = member
+        except (TypeError, ValueError) as e:
+            outcomes.append(WriteOutcome(
+                WriteOutcome.FAILED, reason=f"invalid member: {e}"))
+            continue
+        assignments.append((position, (employee_id, project_id, role, *allocation)))
+        outcomes.append(None)
+
+    results = bulk_assign(assignment for _, assignment in assignments)
+    for (position, _), outcome in zip(assignments, results):
+        outcomes[position] = outcome
+    return outcomes
+
+
+def _existing_ids(cursor, dialect, table, key_column, ids):
+    """Return the subset of ids present in a table."""
+    ids = list(ids)
+    found = set()
+    for start in range(0, len(ids), dialect.max_list_params):
+        condition, params = dialect.in_condition(
+            key_column, ids[start:start + dialect.max_list_params])
+        cursor.execute(f"SELECT {key_column} FROM {table} WHERE {condition}", params)
+        found.update(key for (key,) in cursor.fetchall())
+    return found
+
+
+def get_projects_for_employee(employee_id, use_primary=False):
     """Get all projects assigned to a specific employee."""
-    conn = None
-    try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT 
-                p.project_id,
-                p.project_name,
-                p.start_date,
-                p.end_date,
-                p.status,
-                ep.role,
-                ep.assignment_date
-            FROM Projects p
-            INNER JOIN EmployeeProjects ep ON p.project_id = ep.project_id
-            WHERE ep.employee_id = %s
-            ORDER BY p.project_name
-        """, (employee_id,))
-
-        columns = [description[0] for description in cursor.description]
-        projects = []
-
-        for row in cursor.fetchall():
-            projects.append(dict(zip(columns, row)))
-
-        return projects
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            execute_statement(cursor, PROJECTS_FOR_EMPLOYEE, (employee_id,))
+            return build_records(ProjectAssignment, cursor.fetchall())
 
     except Exception as e:
         print(f"Error getting projects for employee: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
 
-def get_employees_for_project(project_id):
+def get_employees_for_project(project_id, use_primary=False):
     """Get all employees assigned to a specific project."""
-    conn = None
-    try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT 
-                e.employee_id,
-                e.first_name,
-                e.last_name,
-                e.email,
-                e.department,
-                ep.role,
-                ep.assignment_date
-            FROM Employees e
-            INNER JOIN EmployeeProjects ep ON e.employee_id = ep.employee_id
-            WHERE ep.project_id = %s
-            ORDER BY e.last_name, e.first_name
-        """, (project_id,))
-
-        columns = [description[0] for description in cursor.description]
-        employees = []
-
-        for row in cursor.fetchall():
-            employees.append(dict(zip(columns, row)))
-
-        return employees
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            cursor.execute("""
+                SELECT 
+                    e.employee_id,
+                    e.first_name,
+                    e.last_name,
+                    e.email,
+                    e.department,
+                    ep.role,
+                    ep.assignment_date,
+                    ep.allocation_pct,
+                    ep.end_date AS assignment_end_date
+                FROM Employees e
+                INNER JOIN EmployeeProjects ep ON e.employee_id = ep.employee_id
+                WHERE ep.project_id = %s
+                ORDER BY e.last_name, e.first_name
+            """, (project_id,))
+            return build_records(ProjectMember, cursor.fetchall())
 
     except Exception as e:
         print(f"Error getting employees for project: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
+
+
+def list_unassigned_employees(after=None, limit=50, department=None,
+                              include_total=False, use_primary=False):
+    """
+    Retrieve one page of employees who are not assigned to any project.
+
+    Uses a NOT EXISTS anti-join against EmployeeProjects, paged by keyset
+    in the default order of employee_manager.list_employees_page.
+
+    Args:
+        after (tuple): next_cursor of the previous page; None for the first
+        limit (int): Page size
+        department (str or list): Only these department(s)
+        include_total (bool): Also count all unassigned employees matching
+            the filters
+
+    Returns:
+        dict: employees (list of Employee records), next_cursor (tuple, None
+        on the last page) and total (int, None unless requested)
+    """
+    page = {'employees': [], 'next_cursor': None, 'total': None}
+    conditions = [
+        "NOT EXISTS (SELECT 1 FROM EmployeeProjects ep WHERE ep.employee_id = e.employee_id)"]
+    params = []
+    if department:
+        departments = [department] if isinstance(department, str) else list(department)
+        conditions.append(
+            f"e.department IN ({', '.join(['%s'] * len(departments))})")
+        params.extend(departments)
+
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            if include_total:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM Employees e WHERE {' AND '.join(conditions)}",
+                    params)
+                page['total'] = cursor.fetchone()[0]
+
+            if after is not None:
+                conditions = conditions + [
+                    "(e.last_name, e.first_name, e.employee_id) > (%s, %s, %s)"]
+                params = params + list(after)
+
+            # Walks the keyset indexes and probes idx_employee_projects_employee
+            # per row; one extra row tells whether another page follows
+            cursor.execute(f"""
+                SELECT {Employee.COLUMNS} FROM Employees e
+                WHERE {' AND '.join(conditions)}
+                ORDER BY e.last_name, e.first_name, e.employee_id
+                LIMIT %s
+            """, params + [limit + 1])
+
+            employees = build_records(Employee, cursor.fetchall())
+
+            if len(employees) > limit:
+                employees = employees[:limit]
+                last = employees[-1]
+                page['next_cursor'] = (
+                    last['last_name'], last['first_name'], last['employee_id'])
+            page['employees'] = employees
+            return page
+
+    except Exception as e:
+        print(f"Error listing unassigned employees: {e}")
+        return page
+
+
+def assignment_filter(departments=None, project_ids=None):
+    """
+    Build a WHERE clause selecting assignments (aliased ep) by department
+    and project.
+
+    Args:
+        departments (list): Keep employees of these departments; None for all
+        project_ids (list): Keep these projects; None for all
+
+    Returns:
+        tuple: (SQL starting with WHERE, or '' when unfiltered, parameters)
+    """
+    dialect = get_dialect()
+    conditions = []
+    params = []
+    if departments is not None:
+        condition, values = dialect.in_condition('department', departments)
+        conditions.append(
+            f"ep.employee_id IN (SELECT employee_id FROM Employees WHERE {condition})")
+        params.extend(values)
+    if project_ids is not None:
+        condition, values = dialect.in_condition('ep.project_id', project_ids)
+        conditions.append(condition)
+        params.extend(values)
+
+    if not conditions:
+        return '', params
+    return 'WHERE ' + ' AND '.join(conditions), params
+
+
+def count_assignments(departments=None, project_ids=None, use_primary=False):
+    """Count employee-project assignments, optionally filtered (see assignment_filter)."""
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            where, params = assignment_filter(departments, project_ids)
+            cursor.execute(f"SELECT COUNT(*) FROM EmployeeProjects ep {where}", params)
+            return cursor.fetchone()[0]
+
+    except Exception as e:
+        print(f"Error counting assignments: {e}")
+        return 0
+
+
+def get_team_sizes(departments=None, project_ids=None, use_primary=False):
+    """
+    Count the employees assigned to each project in one query.
+
+    Args:
+        departments (list): Only count employees of these departments
+        project_ids (list): Only count these projects
+
+    Returns:
+        dict: project_id -> team size; projects without assignments are
+        absent
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            # Answered from idx_employee_projects_project
+            where, params = assignment_filter(departments, project_ids)
+            cursor.execute(f"""
+                SELECT ep.project_id, COUNT(*)
+                FROM EmployeeProjects ep
+                {where}
+                GROUP BY ep.project_id
+            """, params)
+            return dict(cursor.fetchall())
+
+    except Exception as e:
+        print(f"Error getting team sizes: {e}")
+        return {}
+
+
+def get_assignment_counts_by_employee(departments=None, project_ids=None,
+                                      use_primary=False):
+    """
+    Count the projects each employee is assigned to in one query.
+
+    Args:
+        departments (list): Only count employees of these departments
+        project_ids (list): Only count these projects
+
+    Returns:
+        dict: employee_id -> number of assignments; employees without
+        assignments are absent
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            # Answered from idx_employee_projects_employee
+            where, params = assignment_filter(departments, project_ids)
+            cursor.execute(f"""
+                SELECT ep.employee_id, COUNT(*)
+                FROM EmployeeProjects ep
+                {where}
+                GROUP BY ep.employee_id
+            """, params)
+            return dict(cursor.fetchall())
+
+    except Exception as e:
+        print(f"Error getting assignment counts: {e}")
+        return {}
@@ -0,0 +1,151 @@
+"""
+records.py
+
+Compact row records returned by the manager modules.
+
+A record keeps the row tuple the database driver produced and maps column
+names onto it through a per-class index, so a row costs one small object
+instead of a dict holding its own copy of every key. Records are read-only
+Mappings: record['email'], record.get('email'), dict(record) and
+pd.DataFrame(records) keep working wherever the managers used to return
+dicts. Fields are also available as attributes (record.email).
+
+For DataFrames over large results, the list functions also offer a
+columnar mode (see build_columns) that skips per-row objects entirely.
+"""
+
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """
+    Base class for read-only row records.
+
+    Subclasses declare FIELDS in the order the columns are selected;
+    COLUMNS is the matching comma-separated SELECT list.
+    """
+
+    FIELDS = ()
+    COLUMNS = ''
+    _index = {}
+
+    __slots__ = ('_values',)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._index = {name: position for position, name in enumerate(cls.FIELDS)}
+        cls.COLUMNS = ', '.join(cls.FIELDS)
+
+    def __init__(self, values):
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __getattr__(self, name):
+        index = type(self)._index
+        if name in index:
+            return self._values[index[name]]
+        raise AttributeError(
+            f"{type(self).__name__!r} record has no field {name!r}")
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __reduce__(self):
+        # Driver row types (sqlite3.Row, asyncpg.Record) are not picklable
+        return (type(self), (tuple(self._values),))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={self[name]!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def _asdict(self):
+        """Return the record as a plain dict."""
+        return dict(zip(self.FIELDS, self._values))
+
+
+class Employee(Record):
+    """Row of the Employees table."""
+
+    __slots__ = ()
+    FIELDS = ('employee_id', 'first_name', 'last_name', 'email',
+              'hire_date', 'department', 'created_at', 'updated_at',
+              'version')
+
+
+class Project(Record):
+    """Row of the Projects table."""
+
+    __slots__ = ()
+    FIELDS = ('project_id', 'project_name', 'start_date', 'end_date',
+              'status', 'created_at', 'updated_at')
+
+
+class Assignment(Record):
+    """Row of the employee-project assignment report."""
+
+    __slots__ = ()
+    FIELDS = ('employee_id', 'employee_name', 'department', 'project_id',
+              'project_name', 'project_status', 'role', 'assignment_date')
+
+
+class ProjectAssignment(Record):
+    """A project as seen from one of its assigned employees."""
+
+    __slots__ = ()
+    FIELDS = ('project_id', 'project_name', 'start_date', 'end_date',
+              'status', 'role', 'assignment_date', 'allocation_pct',
+              'assignment_end_date')
+
+
+class ProjectMember(Record):
+    """An employee as seen from a project they are assigned to."""
+
+    __slots__ = ()
+    FIELDS = ('employee_id', 'first_name', 'last_name', 'email',
+              'department', 'role', 'assignment_date', 'allocation_pct',
+              'assignment_end_date')
+
+
+class OverbookedPeriod(Record):
+    """A stretch of days on which an employee is allocated over the limit."""
+
+    __slots__ = ()
+    FIELDS = ('employee_id', 'start_date', 'end_date', 'peak_pct',
+              'project_ids')
+
+
+def build_records(record_type, rows):
+    """
+    Wrap fetched rows in records.
+
+    Args:
+        record_type: Record subclass whose FIELDS match the selected columns
+        rows: Rows from cursor.fetchall()
+
+    Returns:
+        list: One record per row
+    """
+    return list(map(record_type, rows))
+
+
+def build_columns(record_type, rows):
+    """
+    Transpose fetched rows into column lists, ready for pd.DataFrame().
+
+    Args:
+        record_type: Record subclass whose FIELDS match the selected columns
+        rows: Rows from cursor.fetchall()
+
+    Returns:
+        dict: Field name -> list of values; empty when there are no rows
+    """
+    return {name: list(values)
+            for name, values in zip(record_type.FIELDS, zip(*rows))}
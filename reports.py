@@ -1,92 +1,161 @@
-import sqlite3
 from collections import Counter
-from db_connections import get_sqlite_connection, get_sql_connection
-from employee_manager import get_employee_by_id
+from allocation import FULL_ALLOCATION_PCT, get_overbooked_staff
+from db_connections import DataSession, execute_statement, stream_query
+from employee_manager import EMPLOYEE_BY_ID, get_employees_by_ids
+from project_manager import assignment_filter, get_projects_by_ids
 from performance_reviewer import get_performance_reviews_for_employee
+from records import Assignment, Employee, build_columns, build_records
+
+
+_EMPLOYEE_PROJECT_REPORT_SQL = """
+    SELECT 
+        e.employee_id,
+        e.first_name || ' ' || e.last_name as employee_name,
+        e.department,
+        p.project_id,
+        p.project_name,
+        p.status as project_status,
+        ep.role,
+        ep.assignment_date
+    FROM Employees e
+    INNER JOIN EmployeeProjects ep ON e.employee_id = ep.employee_id
+    INNER JOIN Projects p ON ep.project_id = p.project_id
+    {where}
+    ORDER BY e.last_name, e.first_name, p.project_name
+"""
+
+
+def _employee_project_report_query(departments, project_ids):
+    where, params = assignment_filter(departments, project_ids)
+    return _EMPLOYEE_PROJECT_REPORT_SQL.format(where=where), params
+
+
+def generate_employee_project_report(departments=None, project_ids=None,
+                                     use_primary=False, columnar=False):
+    """
+    Generate comprehensive employee-project assignment report.
+
+    Args:
+        departments (list): Only report employees of these departments;
+            None for all
+        project_ids (list): Only report these projects; None for all
+
+    Returns:
+        list: Assignment records, or with columnar=True a dict of column
+        lists for pd.DataFrame()
+    """
+    try:
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
 
+            cursor.execute(*_employee_project_report_query(departments, project_ids))
+            rows = cursor.fetchall()
 
-def generate_employee_project_report():
-    """Generate comprehensive employee-project assignment report."""
-    conn = None
-    try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT 
-                e.employee_id,
-                e.first_name || ' ' || e.last_name as employee_name,
-                e.department,
-                p.project_id,
-                p.project_name,
-                p.status as project_status,
-                ep.role,
-                ep.assignment_date
-            FROM Employees e
-            INNER JOIN EmployeeProjects ep ON e.employee_id = ep.employee_id
-            INNER JOIN Projects p ON ep.project_id = p.project_id
-            ORDER BY e.last_name, e.first_name, p.project_name
-        """)
-
-        columns = [description[0] for description in cursor.description]
-        report_data = []
-
-        for row in cursor.fetchall():
-            report_data.append(dict(zip(columns, row)))
-
-        return report_data
+            if columnar:
+                return build_columns(Assignment, rows)
+            return build_records(Assignment, rows)
 
     except Exception as e:
         print(f"Error generating report: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+        return {} if columnar else []
 
 
-def generate_employee_performance_summary(employee_id):
-    """Generate performance summary for a specific employee."""
-    from performance_reviewer import get_performance_reviews_for_employee
+def iter_employee_project_report(departments=None, project_ids=None,
+                                 itersize=None, use_primary=False):
+    """
+    Iterate over the employee-project report without loading it into memory.
+
+    Args:
+        departments (list): Only report employees of these departments;
+            None for all
+        project_ids (list): Only report these projects; None for all
+        itersize (int): Rows fetched per round trip; defaults to
+            DB_STREAM_ITERSIZE
 
+    Yields:
+        Assignment: One record per row, in generate_employee_project_report()
+        order
+    """
+    sql, params = _employee_project_report_query(departments, project_ids)
+    return stream_query(sql, params, itersize=itersize,
+                        readonly=not use_primary, record=Assignment)
+
+
+def generate_employee_performance_summary(employee_id, use_primary=False):
+    """Generate performance summary for a specific employee."""
     # Get employee details
-    conn = None
     try:
-        conn = get_sql_connection()
-        conn1 = get_sqlite_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT * FROM Employees WHERE employee_id=?", (employee_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            return None
-
-        columns = [description[0] for description in cursor.description]
-        employee = dict(zip(columns, row))
-
-        # Get reviews from MongoDB
-        reviews = get_performance_reviews_for_employee(employee_id)
-
-        # Calculate average rating
-        if reviews:
-            ratings = [r.get('overall_rating', 0)
-                       for r in reviews if r.get('overall_rating')]
-            avg_rating = sum(ratings) / len(ratings) if ratings else 0
-        else:
-            avg_rating = 0
-
-        return {
-            'employee': employee,
-            'reviews': reviews,
-            'average_rating': avg_rating,
-            'review_count': len(reviews)
-        }
+        with DataSession(readonly=not use_primary) as session:
+            cursor = session.cursor()
+
+            execute_statement(cursor, EMPLOYEE_BY_ID, (employee_id,))
+            row = cursor.fetchone()
+
+            if not row:
+                return None
+
+            employee = Employee(row)
+
+            # Get reviews from MongoDB
+            reviews = get_performance_reviews_for_employee(employee_id)
+
+            # Calculate average rating
+            if reviews:
+                ratings = [r.get('overall_rating', 0)
+                           for r in reviews if r.get('overall_rating')]
+                avg_rating = sum(ratings) / len(ratings) if ratings else 0
+            else:
+                avg_rating = 0
+
+            return {
+                'employee': employee,
+                'reviews': reviews,
+                'average_rating': avg_rating,
+                'review_count': len(reviews)
+            }
 
     except Exception as e:
         print(f"Error generating summary: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+
+def generate_overbooked_staff_report(limit=FULL_ALLOCATION_PCT, since=None,
+                                     use_primary=False):
+    """
+    List the periods in which employees are allocated over the limit.
+
+    Args:
+        limit (int): Highest total allocation_pct that is not overbooked
+        since (date): Ignore assignments that ended before this day
+
+    Returns:
+        list: One dict per overbooked period with employee details, the
+        period's start and end (None if open-ended), peak allocation and
+        the names of the projects involved
+    """
+    periods = get_overbooked_staff(limit, since, use_primary)
+    if not periods:
+        return []
+
+    employees = get_employees_by_ids(
+        {period['employee_id'] for period in periods}, use_primary)
+    projects = get_projects_by_ids(
+        {project_id for period in periods for project_id in period['project_ids']},
+        use_primary)
+
+    report = []
+    for period in periods:
+        employee = employees.get(period['employee_id'])
+        report.append({
+            'employee_id': period['employee_id'],
+            'employee_name': (f"{employee['first_name']} {employee['last_name']}"
+                              if employee else None),
+            'department': employee['department'] if employee else None,
+            'start_date': period['start_date'],
+            'end_date': period['end_date'],
+            'peak_pct': period['peak_pct'],
+            'projects': ', '.join(
+                projects[project_id]['project_name']
+                for project_id in period['project_ids'] if project_id in projects),
+        })
+    return report
@@ -8,9 +8,14 @@ Run with: streamlit run streamlit_app.py
 """
 
 from typing import Optional, List, Dict
+from collections.abc import Mapping
+import csv
+import heapq
+import io
+import itertools
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import pandas as pd
 import streamlit as st
 
@@ -31,23 +36,43 @@ try:
         get_employee_by_id,
         list_all_employees,
         update_employee,
-        delete_employee
+        delete_employee,
+        bulk_add_employees,
+        batch_update_employees,
+        get_employees_by_ids,
+        list_employees_page,
+        list_departments,
+        search_employees,
+        EMPLOYEE_FIELDS,
+        SEARCH_LIMIT_MAX
     )
     from project_manager import (
         add_project,
-        assign_employee_to_project,
+        assign_employees_to_project,
         get_projects_for_employee,
         list_all_projects,
-        get_employees_for_project
+        get_employees_for_project,
+        count_assignments,
+        get_assignment_counts_by_employee,
+        list_unassigned_employees,
+        get_projects_active_between,
+        get_team_sizes
     )
     from performance_reviewer import (
         submit_performance_review,
         get_performance_reviews_for_employee
     )
+    from offboarding import offboard_employees
     from reports import (
-        generate_employee_project_report,
+        iter_employee_project_report,
+        generate_overbooked_staff_report,
         generate_employee_performance_summary
     )
+    from async_db_connections import gather, run_async
+    from db_connections import bind_write_marker, get_backend_health, start_keep_warm
+    import async_employee_manager
+    import async_project_manager
+    import async_performance_reviewer
 except ImportError:
     st.error("⚠️ Please ensure all manager modules are in the same directory")
     st.stop()
@@ -93,6 +118,9 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Keep read-your-writes routing per user session across reruns
+bind_write_marker(st.session_state)
+
 # Initialize session state
 if 'notification' not in st.session_state:
     st.session_state.notification = None
@@ -182,6 +210,30 @@ def safe_get_employee_id(value):
         return None
 
 
+# Rows of the employee-project report shown on the page
+REPORT_PREVIEW_ROWS = 1000
+
+
+def rows_to_csv_bytes(rows):
+    """
+    Encode an iterable of row dicts as UTF-8 CSV.
+
+    Args:
+        rows: Iterable of dicts (or records) sharing the same keys
+
+    Returns:
+        bytes: CSV with a header line, or empty if there are no rows
+    """
+    buffer = io.StringIO(newline='')
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+    return buffer.getvalue().encode('utf-8')
+
+
 def safe_date_parse(date_value):
     """
     Safely parse date from various formats.
@@ -283,17 +335,9 @@ def show_dashboard():
             )
 
         with col4:
-            # Count total assignments
-            assignment_count = 0
-            if employees:
-                for emp in employees:
-                    emp_projects = get_projects_for_employee(
-                        emp['employee_id'])
-                    if emp_projects:
-                        assignment_count += len(emp_projects)
             st.metric(
                 label="🔗 Total Assignments",
-                value=assignment_count
+                value=count_assignments()
             )
 
         st.divider()
@@ -387,21 +431,31 @@ def show_employee_management():
         st.subheader("All Employees")
 
         try:
-            employees = list_all_employees()
+            departments = list_departments()
 
-            if employees:
-                df = pd.DataFrame(employees)
-
-                # Add filters
-                col1, col2 = st.columns(2)
+            if departments:
+                # Filters are applied in SQL; only the visible page is fetched
+                col1, col2, col3 = st.columns(3)
                 with col1:
                     dept_filter = st.multiselect(
                         "Filter by Department",
-                        options=df['department'].unique(),
-                        default=df['department'].unique()
+                        options=departments,
+                        default=departments
                     )
 
                 with col2:
+                    name_prefix = st.text_input("Name starts with")
+
+                with col3:
+                    hired_range = st.date_input(
+                        "Hired between",
+                        value=(),
+                        max_value=date.today()
+                    )
+
+                col4, col5 = st.columns(2)
+                with col4:
+                    # Each order pages through its own keyset index
                     sort_options = {
                         "ID": "employee_id",
                         "First Name": "first_name",
@@ -413,13 +467,50 @@ def show_employee_management():
                         "Sort by", list(sort_options.keys()))
                     sort_by = sort_options[sort_by_label]
 
-                # Apply filters
-                df_filtered = df[df['department'].isin(dept_filter)]
-                df_filtered = df_filtered.sort_values(sort_by)
+                with col5:
+                    page_size = st.selectbox(
+                        "Rows per page", [25, 50, 100, 250], index=1)
+
+                hired_from = hired_range[0] if len(hired_range) > 0 else None
+                hired_to = hired_range[1] if len(hired_range) > 1 else None
+
+                # Keyset cursors of the pages visited so far; reset whenever
+                # the filters or the order change
+                filter_key = (tuple(dept_filter), name_prefix,
+                              hired_from, hired_to, sort_by, page_size)
+                if st.session_state.get('employee_page_filters') != filter_key:
+                    st.session_state.employee_page_filters = filter_key
+                    st.session_state.employee_page_cursors = [None]
+                cursors = st.session_state.employee_page_cursors
+
+                if not dept_filter:
+                    # As before paging: no departments selected, no rows
+                    page = {'employees': [], 'next_cursor': None, 'total': 0}
+                else:
+                    # Count only on the first page; later pages reuse it
+                    first_page = len(cursors) == 1
+                    page = list_employees_page(
+                        after=cursors[-1],
+                        limit=page_size,
+                        department=dept_filter,
+                        hired_from=hired_from,
+                        hired_to=hired_to,
+                        name_prefix=name_prefix or None,
+                        include_total=first_page,
+                        order_by=sort_by
+                    )
+                    if first_page:
+                        st.session_state.employee_page_total = page['total']
+                    page['total'] = st.session_state.get('employee_page_total')
+                page_df = pd.DataFrame(page['employees'])
+
+                total_pages = max(1, -(-(page['total'] or 0) // page_size))
+                st.caption(
+                    f"{page['total'] or 0} employees · page {len(cursors)} of {total_pages}")
 
                 # Display table
                 st.dataframe(
-                    df_filtered,
+                    page_df,
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -429,15 +520,28 @@ def show_employee_management():
                         "email": "Employee Email",
                         "hire_date": "Employee Hire Date",
                         "department": "Employee Department",
-                        "created_at": "Created At"
+                        "created_at": "Created At",
+                        "updated_at": "Updated At"
                     }
                 )
 
+                col_prev, col_next = st.columns(2)
+                with col_prev:
+                    if st.button("◀ Previous", disabled=len(cursors) == 1,
+                                 use_container_width=True):
+                        cursors.pop()
+                        st.rerun()
+                with col_next:
+                    if st.button("Next ▶", disabled=page['next_cursor'] is None,
+                                 use_container_width=True):
+                        cursors.append(page['next_cursor'])
+                        st.rerun()
+
                 # Export option
-                csv = df_filtered.to_csv(index=False)
+                csv_data = page_df.to_csv(index=False)
                 st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
+                    label="📥 Download page as CSV",
+                    data=csv_data,
                     file_name=f"employees_{datetime.now().strftime('%Y%m%d')}.csv",
                     mime="text/csv"
                 )
@@ -497,6 +601,34 @@ def show_employee_management():
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
 
+        st.markdown("---")
+        st.subheader("Bulk Import")
+        st.caption(
+            "Upload a CSV with the columns: " + ", ".join(EMPLOYEE_FIELDS))
+
+        uploaded = st.file_uploader("Employees CSV", type=["csv"])
+        if uploaded is not None and st.button("📤 Import Employees", use_container_width=True):
+            try:
+                lines = io.TextIOWrapper(uploaded, encoding="utf-8-sig")
+                with st.spinner("Importing employees..."):
+                    result = bulk_add_employees(csv.DictReader(lines))
+
+                if result.inserted:
+                    st.success(
+                        f"✅ Imported {len(result.inserted)} employees")
+                if result.rejected:
+                    st.warning(f"⚠️ {len(result.rejected)} rows were rejected")
+                    st.dataframe(
+                        pd.DataFrame(
+                            # +2: header line and 1-based numbering
+                            [{"CSV Line": position + 2, "Reason": reason}
+                             for position, reason in result.rejected]),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+            except Exception as e:
+                st.error(f"Error importing employees: {str(e)}")
+
     # Tab 3: Edit Employee
     with tabs[2]:
         st.subheader("Edit Employee")
@@ -576,14 +708,14 @@ def show_employee_management():
 
                             if delete_btn:
                                 try:
-                                    success = delete_employee(emp_id)
-                                    if success:
+                                    outcome = delete_employee(emp_id)
+                                    if outcome:
                                         st.success(
                                             "✅ Employee deleted successfully!")
                                         st.rerun()
                                     else:
                                         st.error(
-                                            "Cannot delete: Employee has assignments")
+                                            f"Cannot delete: {outcome.reason}")
                                 except Exception as e:
                                     st.error(f"Error deleting: {str(e)}")
             else:
@@ -592,6 +724,103 @@ def show_employee_management():
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
+        st.markdown("---")
+        st.subheader("Bulk Edit")
+
+        try:
+            departments = list_departments()
+
+            if departments:
+                bulk_dept = st.selectbox(
+                    "Department", departments, key="bulk_edit_department")
+                page = list_employees_page(limit=200, department=bulk_dept)
+
+                # employee_id and version identify what each edit was based on
+                original = pd.DataFrame(
+                    [{field: emp[field] for field in ('employee_id', 'version', *EMPLOYEE_FIELDS)}
+                     for emp in page['employees']])
+                if page['next_cursor']:
+                    st.caption(
+                        "Showing the first 200 employees of this department")
+
+                edited = st.data_editor(
+                    original,
+                    key="bulk_employee_editor",
+                    use_container_width=True,
+                    hide_index=True,
+                    disabled=["employee_id", "version"],
+                    column_config={
+                        "employee_id": "Employee ID",
+                        "version": "Version",
+                        "first_name": "First Name",
+                        "last_name": "Last Name",
+                        "email": "Email",
+                        "hire_date": st.column_config.DateColumn("Hire Date"),
+                        "department": "Department"
+                    }
+                )
+
+                if st.button("💾 Save All Changes", use_container_width=True):
+                    changes = []
+                    for before, after in zip(original.to_dict('records'),
+                                             edited.to_dict('records')):
+                        changed = {field: after[field] for field in EMPLOYEE_FIELDS
+                                   if after[field] != before[field]}
+                        if changed:
+                            changes.append({'employee_id': before['employee_id'],
+                                            'version': before['version'],
+                                            **changed})
+
+                    if not changes:
+                        st.info("No changes to save")
+                    else:
+                        outcomes = batch_update_employees(changes)
+                        saved = sum(1 for outcome in outcomes if outcome)
+                        if saved:
+                            st.success(f"✅ Saved {saved} employee(s)")
+                        for outcome in outcomes:
+                            if not outcome:
+                                st.warning(
+                                    f"Employee {outcome.row_id}: {outcome.reason}")
+            else:
+                st.info("No employees available to edit")
+
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+
+        st.markdown("---")
+        st.subheader("Bulk Offboarding")
+        st.caption("Removes the employees and their project assignments, "
+                   "and moves their reviews to the archive.")
+
+        offboard_input = st.text_area(
+            "Employee IDs (comma or newline separated)", key="offboard_ids")
+        confirm_offboard = st.checkbox(
+            "I understand this cannot be undone", key="offboard_confirm")
+
+        if st.button("🚪 Offboard Employees", type="secondary",
+                     disabled=not confirm_offboard):
+            offboard_ids = [safe_get_employee_id(value)
+                            for value in offboard_input.replace(',', '\n').split()]
+            if not offboard_ids or None in offboard_ids:
+                st.error("Please enter valid employee IDs")
+            else:
+                progress_bar = st.progress(0.0)
+                result = offboard_employees(
+                    offboard_ids,
+                    progress=lambda done, total: progress_bar.progress(done / total))
+
+                st.success(
+                    f"✅ Offboarded {len(result.offboarded)} employee(s), ended "
+                    f"{result.assignments_ended} assignment(s), archived "
+                    f"{result.reviews_archived} review(s)")
+                if result.not_found:
+                    st.info(f"Already gone: {', '.join(map(str, result.not_found))}")
+                if result.failed:
+                    st.error(
+                        f"{len(result.failed)} employee(s) failed and can be "
+                        f"retried: {result.failed[0][1]}")
+
     # Tab 4: Search
     with tabs[3]:
         st.subheader("Search Employees")
@@ -600,36 +829,27 @@ def show_employee_management():
 
         if search_term:
             try:
-                employees = list_all_employees()
-
-                if employees:
-                    df = pd.DataFrame(employees)
-
-                    # Filter
-                    mask = (
-                        df['first_name'].str.contains(search_term, case=False, na=False) |
-                        df['last_name'].str.contains(search_term, case=False, na=False) |
-                        df['email'].str.contains(search_term, case=False, na=False) |
-                        df['department'].str.contains(
-                            search_term, case=False, na=False)
-                    )
-
-                    results = df[mask]
-
-                    if not results.empty:
-                        st.success(f"Found {len(results)} result(s)")
-                        st.dataframe(
-                            results, use_container_width=True, hide_index=True, column_config={
-                                "employee_id": "Employee ID",
-                                "first_name": "Employee First Name",
-                                "last_name": "Employee Last Name",
-                                "email": "Employee Email",
-                                "hire_date": "Employee Hire Date",
-                                "department": "Employee Department",
-                                "created_at": "Created At"
-                            })
-                    else:
-                        st.warning("No results found")
+                # Matching and ranking happen in the database
+                results = search_employees(search_term, limit=SEARCH_LIMIT_MAX)
+
+                if results:
+                    st.success(f"Found {len(results)} result(s)")
+                    if len(results) == SEARCH_LIMIT_MAX:
+                        st.caption(
+                            f"Showing the best {SEARCH_LIMIT_MAX} matches; refine the search to narrow them down")
+                    st.dataframe(
+                        pd.DataFrame(results), use_container_width=True, hide_index=True, column_config={
+                            "employee_id": "Employee ID",
+                            "first_name": "Employee First Name",
+                            "last_name": "Employee Last Name",
+                            "email": "Employee Email",
+                            "hire_date": "Employee Hire Date",
+                            "department": "Employee Department",
+                            "created_at": "Created At",
+                            "updated_at": "Updated At"
+                        })
+                else:
+                    st.warning("No results found")
             except Exception as e:
                 st.error(f"Search error: {str(e)}")
 
@@ -687,7 +907,8 @@ def show_project_management():
                         "start_date": "Project Start Date",
                         "end_date": "Project End Date",
                         "status": "Project Status",
-                        "created_at": "Created At"
+                        "created_at": "Created At",
+                        "updated_at": "Updated At"
                     }
                 )
             else:
@@ -696,6 +917,48 @@ def show_project_management():
         except Exception as e:
             st.error(f"Error loading projects: {str(e)}")
 
+        st.markdown("---")
+        st.subheader("Project Timeline")
+
+        try:
+            col1, col2 = st.columns(2)
+            with col1:
+                window_start = st.date_input(
+                    "From", value=date.today() - timedelta(days=90), key="timeline_from")
+            with col2:
+                window_end = st.date_input(
+                    "To", value=date.today() + timedelta(days=180), key="timeline_to")
+
+            if window_end < window_start:
+                st.error("The end of the window must not be before its start")
+            else:
+                # Only the projects overlapping the visible window are loaded
+                active = get_projects_active_between(window_start, window_end)
+
+                if active:
+                    timeline = pd.DataFrame(active)
+                    # Open-ended projects run to the edge of the window
+                    timeline['end_date'] = [
+                        max(end or window_end, start)
+                        for start, end in zip(timeline['start_date'], timeline['end_date'])]
+
+                    fig = px.timeline(
+                        timeline,
+                        x_start='start_date',
+                        x_end='end_date',
+                        y='project_name',
+                        color='status',
+                        title=f"{len(active)} project(s) active in this window"
+                    )
+                    fig.update_yaxes(autorange="reversed", title=None)
+                    fig.update_xaxes(range=[window_start, window_end])
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("No projects active in this window")
+
+        except Exception as e:
+            st.error(f"Error loading timeline: {str(e)}")
+
     # Tab 2: Add Project
     with tabs[1]:
         st.subheader("Create New Project")
@@ -743,7 +1006,7 @@ def show_project_management():
 
     # Tab 3: Assign Employees
     with tabs[2]:
-        st.subheader("Assign Employee to Project")
+        st.subheader("Assign Employees to Project")
 
         try:
             employees = list_all_employees()
@@ -758,8 +1021,8 @@ def show_project_management():
                             f"{e['first_name']} {e['last_name']}": e['employee_id']
                             for e in employees
                         }
-                        selected_emp = st.selectbox(
-                            "Select Employee *", list(emp_options.keys()))
+                        selected_emps = st.multiselect(
+                            "Select Employees *", list(emp_options.keys()))
 
                     with col2:
                         proj_options = {
@@ -772,26 +1035,37 @@ def show_project_management():
                     role = st.text_input(
                         "Role/Position *", placeholder="e.g., Lead Developer, Designer")
 
+                    col3, col4 = st.columns(2)
+                    with col3:
+                        allocation_pct = st.number_input(
+                            "Allocation (%)", min_value=1, max_value=100, value=100, step=5)
+                    with col4:
+                        assignment_end = st.date_input(
+                            "Assignment End Date (optional)", value=None)
+
                     submitted = st.form_submit_button(
                         "🔗 Assign", use_container_width=True)
 
                     if submitted:
-                        if not role:
-                            st.error("Role is required")
+                        if not role or not selected_emps:
+                            st.error("Employees and role are required")
                         else:
                             try:
-                                success = assign_employee_to_project(
-                                    emp_options[selected_emp],
+                                outcomes = assign_employees_to_project(
                                     proj_options[selected_proj],
-                                    role.strip()
+                                    [(emp_options[name], role.strip(),
+                                      allocation_pct, assignment_end)
+                                     for name in selected_emps]
                                 )
 
-                                if success:
+                                assigned = sum(1 for outcome in outcomes if outcome)
+                                if assigned:
                                     st.success(
-                                        "✅ Employee assigned successfully!")
-                                else:
-                                    st.error(
-                                        "Assignment failed. May already exist.")
+                                        f"✅ {assigned} employee(s) assigned successfully!")
+                                for name, outcome in zip(selected_emps, outcomes):
+                                    if not outcome:
+                                        st.error(
+                                            f"{name}: {outcome.reason}")
                             except Exception as e:
                                 st.error(f"Error: {str(e)}")
             else:
@@ -829,7 +1103,9 @@ def show_project_management():
                                          "email": "Employee Email",
                                          "department": "Employee Department",
                                          "role": "Employee Role",
-                                         "assignment_date": "Employee Assignment Date"
+                                         "assignment_date": "Employee Assignment Date",
+                                         "allocation_pct": "Allocation %",
+                                         "assignment_end_date": "Assignment End Date"
                                      })
                     else:
                         st.info("No employees assigned to this project yet")
@@ -1051,9 +1327,13 @@ def show_performance_reviews():
                             return default
                 ratings_data = []
 
+                # One query for every employee's reviews
+                reviews_by_employee = run_async(
+                    async_performance_reviewer.get_reviews_for_employees(
+                        [emp['employee_id'] for emp in employees]))
+
                 for emp in employees:
-                    reviews = get_performance_reviews_for_employee(
-                        emp['employee_id'])
+                    reviews = reviews_by_employee.get(emp['employee_id'])
                     if reviews:
                         for review in reviews:
                             rating = safe_float_conversion(
@@ -1131,30 +1411,46 @@ def show_reports():
         st.subheader("Employee-Project Assignment Report")
 
         try:
-            report_data = generate_employee_project_report()
+            # Filters apply in SQL, so the preview, the totals and the export
+            # all cover the same assignments. A full selection is sent as
+            # None to skip the filter altogether
+            departments = list_departments()
+            projects = {project['project_id']: project['project_name']
+                        for project in list_all_projects()}
 
-            if report_data:
-                df = pd.DataFrame(report_data)
-
-                # Filters
-                col1, col2 = st.columns(2)
-                with col1:
-                    if 'department' in df.columns:
-                        dept_filter = st.multiselect(
-                            "Filter by Department",
-                            options=df['department'].unique(),
-                            default=df['department'].unique()
-                        )
-                        df = df[df['department'].isin(dept_filter)]
-
-                with col2:
-                    if 'project_name' in df.columns:
-                        proj_filter = st.multiselect(
-                            "Filter by Project",
-                            options=df['project_name'].unique(),
-                            default=df['project_name'].unique()
-                        )
-                        df = df[df['project_name'].isin(proj_filter)]
+            col1, col2 = st.columns(2)
+            with col1:
+                dept_filter = st.multiselect(
+                    "Filter by Department",
+                    options=departments,
+                    default=departments
+                )
+            with col2:
+                proj_filter = st.multiselect(
+                    "Filter by Project",
+                    options=list(projects),
+                    default=list(projects),
+                    format_func=lambda project_id: projects[project_id]
+                )
+            report_filter = {
+                'departments': (None if set(dept_filter) == set(departments)
+                                else dept_filter),
+                'project_ids': (None if set(proj_filter) == set(projects)
+                                else proj_filter),
+            }
+
+            # Only a preview is loaded; totals come from aggregate queries
+            # and the full report is streamed straight into the CSV export
+            report_rows = iter_employee_project_report(**report_filter)
+            preview = list(itertools.islice(report_rows, REPORT_PREVIEW_ROWS + 1))
+            report_rows.close()
+
+            if preview:
+                df = pd.DataFrame(preview[:REPORT_PREVIEW_ROWS])
+                if len(preview) > REPORT_PREVIEW_ROWS:
+                    st.caption(
+                        f"Showing the first {REPORT_PREVIEW_ROWS} assignments; "
+                        "download the CSV below for every matching assignment")
 
                 # Display
                 st.dataframe(df, use_container_width=True, hide_index=True, column_config={
@@ -1172,42 +1468,52 @@ def show_reports():
                 st.divider()
                 col1, col2, col3 = st.columns(3)
 
+                assignment_counts = get_assignment_counts_by_employee(**report_filter)
+
                 with col1:
-                    st.metric("Total Assignments", len(df))
+                    st.metric("Total Assignments", count_assignments(**report_filter))
 
                 with col2:
-                    unique_employees = df['employee_name'].nunique(
-                    ) if 'employee_name' in df.columns else 0
-                    st.metric("Employees with Projects", unique_employees)
+                    st.metric("Employees with Projects", len(assignment_counts))
 
                 with col3:
-                    unique_projects = df['project_name'].nunique(
-                    ) if 'project_name' in df.columns else 0
-                    st.metric("Active Projects", unique_projects)
+                    st.metric("Active Projects", len(get_team_sizes(**report_filter)))
 
                 # Visualization
-                if 'employee_name' in df.columns and 'project_name' in df.columns:
+                if assignment_counts:
                     st.subheader("Assignment Distribution")
-                    assignments_per_emp = df.groupby(
-                        'employee_name').size().reset_index(name='count')
+                    top_counts = heapq.nlargest(
+                        10, assignment_counts.items(), key=lambda item: item[1])
+                    top_employees = get_employees_by_ids(
+                        [employee_id for employee_id, _ in top_counts])
+                    assignments_per_emp = pd.DataFrame([{
+                        'employee_name': (
+                            f"{top_employees[employee_id]['first_name']} "
+                            f"{top_employees[employee_id]['last_name']}"
+                            if employee_id in top_employees else str(employee_id)),
+                        'count': count
+                    } for employee_id, count in top_counts])
                     fig = px.bar(
-                        assignments_per_emp.nlargest(10, 'count'),
+                        assignments_per_emp,
                         x='employee_name',
                         y='count',
                         title="Top 10 Employees by Project Count"
                     )
                     st.plotly_chart(fig, use_container_width=True)
 
-                # Export
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Report as CSV",
-                    data=csv,
-                    file_name=f"employee_project_report_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
-                )
+                # Export: the filtered report is only built when asked for
+                if st.button("📄 Prepare Report CSV"):
+                    with st.spinner("Exporting report..."):
+                        csv_data = rows_to_csv_bytes(
+                            iter_employee_project_report(**report_filter))
+                    st.download_button(
+                        label="📥 Download Report as CSV",
+                        data=csv_data,
+                        file_name=f"employee_project_report_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
             else:
-                st.info("No assignment data available")
+                st.info("No assignments match the selected filters")
 
         except Exception as e:
             st.error(f"Error generating report: {str(e)}")
@@ -1230,8 +1536,13 @@ def show_reports():
                 if selected:
                     emp_id = emp_options[selected]
 
-                    # Get employee info
-                    employee = get_employee_by_id(emp_id)
+                    # Fetch employee info, reviews and projects concurrently
+                    employee, reviews, projects = gather(
+                        async_employee_manager.get_employee_by_id(emp_id),
+                        async_performance_reviewer.get_performance_reviews_for_employee(
+                            emp_id),
+                        async_project_manager.get_projects_for_employee(emp_id)
+                    )
 
                     if employee:
                         # Display employee card
@@ -1260,9 +1571,6 @@ def show_reports():
 
                         st.divider()
 
-                        # Get performance reviews
-                        reviews = get_performance_reviews_for_employee(emp_id)
-
                         if reviews:
                             # Calculate metrics
                             ratings = [
@@ -1345,7 +1653,6 @@ def show_reports():
 
                             # Projects
                             st.subheader("Current Projects")
-                            projects = get_projects_for_employee(emp_id)
 
                             if projects:
                                 df_proj = pd.DataFrame(projects)
@@ -1357,7 +1664,9 @@ def show_reports():
                                         "end_date": "Project End Date",
                                         "status": "Project Status",
                                         "role": "Employee Role",
-                                        "assignment_date": "Employee Assignment Date"
+                                        "assignment_date": "Employee Assignment Date",
+                                        "allocation_pct": "Allocation %",
+                                        "assignment_end_date": "Assignment End Date"
                                     })
                             else:
                                 st.info("No projects assigned")
@@ -1383,14 +1692,25 @@ def show_reports():
                 "Recent Hires (Last 6 Months)",
                 "Performance Distribution",
                 "Unassigned Employees",
-                "Project Workload"
+                "Project Workload",
+                "Overbooked Staff"
             ]
         )
 
+        if report_type == "Unassigned Employees":
+            unassigned_dept = st.selectbox(
+                "Department", ["All"] + list_departments(),
+                key="unassigned_department")
+
+        if report_type == "Overbooked Staff":
+            overbooked_since = st.date_input(
+                "Ignore assignments that ended before", value=date.today(),
+                key="overbooked_since")
+
         if st.button("Generate Report", type="primary"):
             try:
                 if report_type == "Employees by Department":
-                    employees = list_all_employees()
+                    employees = list_all_employees(columnar=True)
                     if employees:
                         df = pd.DataFrame(employees)
                         summary = df.groupby(
@@ -1407,7 +1727,7 @@ def show_reports():
                         st.plotly_chart(fig, use_container_width=True)
 
                 elif report_type == "Projects by Status":
-                    projects = list_all_projects()
+                    projects = list_all_projects(columnar=True)
                     if projects:
                         df = pd.DataFrame(projects)
                         summary = df.groupby(
@@ -1424,7 +1744,7 @@ def show_reports():
                         st.plotly_chart(fig, use_container_width=True)
 
                 elif report_type == "Recent Hires (Last 6 Months)":
-                    employees = list_all_employees()
+                    employees = list_all_employees(columnar=True)
                     if employees:
                         df = pd.DataFrame(employees)
                         if 'hire_date' in df.columns:
@@ -1443,16 +1763,19 @@ def show_reports():
                                 "last_name": "Employee Last Name",
                                 "hire_date": "Employee Hire Date",
                                 "department": "Department",
-                                "created_at": "Created At"
+                                "created_at": "Created At",
+                                "updated_at": "Updated At"
                             })
 
                 elif report_type == "Performance Distribution":
                     employees = list_all_employees()
                     ratings_data = []
 
-                    for emp in employees:
-                        reviews = get_performance_reviews_for_employee(
-                            emp['employee_id'])
+                    reviews_by_employee = run_async(
+                        async_performance_reviewer.get_reviews_for_employees(
+                            [emp['employee_id'] for emp in employees]))
+
+                    for reviews in reviews_by_employee.values():
                         if reviews:
                             for review in reviews:
                                 ratings_data.append({
@@ -1482,18 +1805,17 @@ def show_reports():
                             st.metric("Total Reviews", len(df))
 
                 elif report_type == "Unassigned Employees":
-                    employees = list_all_employees()
-                    unassigned = []
-
-                    for emp in employees:
-                        projects = get_projects_for_employee(
-                            emp['employee_id'])
-                        if not projects or len(projects) == 0:
-                            unassigned.append(emp)
+                    page = list_unassigned_employees(
+                        limit=1000, include_total=True,
+                        department=None if unassigned_dept == "All" else unassigned_dept)
+                    unassigned = page['employees']
 
                     if unassigned:
                         st.warning(
-                            f"Found {len(unassigned)} unassigned employees")
+                            f"Found {page['total']} unassigned employees")
+                        if page['next_cursor']:
+                            st.caption(
+                                f"Showing the first {len(unassigned)}")
                         df = pd.DataFrame(unassigned)
                         st.dataframe(df, use_container_width=True,
                                      hide_index=True, column_config={
@@ -1503,22 +1825,20 @@ def show_reports():
                                          "email": "Employee Email",
                                          "hire_date": "Employee Hire Date",
                                          "department": "Department",
-                                         "created_at": "Created At"
+                                         "created_at": "Created At",
+                                         "updated_at": "Updated At"
                                      })
                     else:
                         st.success("All employees are assigned to projects!")
 
                 elif report_type == "Project Workload":
                     projects = list_all_projects()
-                    workload_data = []
-
-                    for proj in projects:
-                        team = get_employees_for_project(proj['project_id'])
-                        workload_data.append({
-                            'Project': proj['project_name'],
-                            'Status': proj['status'],
-                            'Team Size': len(team) if team else 0
-                        })
+                    team_sizes = get_team_sizes()
+                    workload_data = [{
+                        'Project': proj['project_name'],
+                        'Status': proj['status'],
+                        'Team Size': team_sizes.get(proj['project_id'], 0)
+                    } for proj in projects]
 
                     if workload_data:
                         df = pd.DataFrame(workload_data)
@@ -1534,6 +1854,27 @@ def show_reports():
                         )
                         st.plotly_chart(fig, use_container_width=True)
 
+                elif report_type == "Overbooked Staff":
+                    overbooked = generate_overbooked_staff_report(
+                        since=overbooked_since)
+
+                    if overbooked:
+                        st.warning(
+                            f"Found {len(overbooked)} overbooked period(s) for "
+                            f"{len({row['employee_id'] for row in overbooked})} employee(s)")
+                        st.dataframe(pd.DataFrame(overbooked), use_container_width=True,
+                                     hide_index=True, column_config={
+                                         "employee_id": "Employee ID",
+                                         "employee_name": "Employee Name",
+                                         "department": "Department",
+                                         "start_date": "From",
+                                         "end_date": "Until",
+                                         "peak_pct": "Peak Allocation %",
+                                         "projects": "Projects"
+                                     })
+                    else:
+                        st.success("Nobody is allocated over 100%!")
+
             except Exception as e:
                 st.error(f"Error generating report: {str(e)}")
 
@@ -1564,16 +1905,7 @@ def show_settings():
                     employees) if employees else 0)
                 st.metric("Total Projects", len(projects) if projects else 0)
 
-                # Calculate total assignments
-                assignment_count = 0
-                if employees:
-                    for emp in employees:
-                        emp_projects = get_projects_for_employee(
-                            emp['employee_id'])
-                        if emp_projects:
-                            assignment_count += len(emp_projects)
-
-                st.metric("Total Assignments", assignment_count)
+                st.metric("Total Assignments", count_assignments())
 
             with col2:
                 st.markdown("### NoSQL Database (MongoDB)")
@@ -1645,6 +1977,8 @@ def show_settings():
                         ObjectId = None
 
                     def _serialize(obj):
+                        if isinstance(obj, Mapping):
+                            return dict(obj)
                         if isinstance(obj, (date, dt)):
                             return obj.isoformat()
                         if ObjectId and isinstance(obj, ObjectId):
@@ -1747,8 +2081,15 @@ def show_settings():
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
+@st.cache_resource
+def start_background_services():
+    """Pre-connect and keep the databases warm (once per server process)"""
+    return start_keep_warm()
+
+
 def main():
     """Main application entry point"""
+    start_background_services()
 
     # Sidebar navigation
     st.sidebar.title("🏢 Navigation")
@@ -1779,6 +2120,13 @@ def main():
     except:
         pass
 
+    # Surface unreachable backends instead of silently showing empty data
+    health = get_backend_health()
+    if health['postgres'] != 'closed':
+        st.sidebar.warning("⚠️ PostgreSQL is unreachable; data may be incomplete")
+    if health['mongo'] != 'closed':
+        st.sidebar.warning("⚠️ MongoDB is unreachable; reviews may be missing")
+
     st.sidebar.divider()
     st.sidebar.markdown("""
     ### Quick Actions
@@ -0,0 +1,81 @@
+"""
+Read-your-writes routing between the primary and the read replica.
+"""
+
+import contextvars
+
+import pytest
+
+import db_connections
+from dialects import DIALECTS
+
+
+class FakePool:
+    """Pool stand-in whose connections are just the pool's name."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def checkout(self):
+        return self.name
+
+    def release(self, conn):
+        pass
+
+
+@pytest.fixture
+def replica_configured(monkeypatch):
+    get_config = db_connections.get_config
+
+    def fake_get_config(name):
+        if name == 'REPLICA_SETTINGS':
+            return {'url': 'postgresql://replica', 'max_lag': 5}
+        return get_config(name)
+
+    monkeypatch.setattr(db_connections, 'get_config', fake_get_config)
+    monkeypatch.setattr(db_connections, 'get_dialect', lambda: DIALECTS['postgresql'])
+    monkeypatch.setattr(db_connections, '_replica_within_lag', lambda conn, max_lag: True)
+    monkeypatch.setattr(db_connections, '_ensure_sql_schema', lambda conn: None)
+    monkeypatch.setattr(db_connections, '_sql_pools', {
+        'primary': FakePool('primary'),
+        'replica': FakePool('replica'),
+    })
+
+
+def _read_connection(store):
+    """Borrow a read connection in a fresh context, as a new request would."""
+    def request():
+        db_connections.bind_write_marker(store)
+        return db_connections.get_sql_connection(readonly=True)
+    return contextvars.Context().run(request)
+
+
+def test_reads_use_replica_without_recent_write(replica_configured):
+    assert _read_connection({}) == 'replica'
+
+
+def test_recent_write_keeps_reads_on_primary_in_later_requests(replica_configured):
+    session_state = {}
+    contextvars.Context().run(lambda: (
+        db_connections.bind_write_marker(session_state),
+        db_connections.note_primary_write(),
+    ))
+
+    assert _read_connection(session_state) == 'primary'
+
+
+def test_write_marker_is_per_user_session(replica_configured):
+    writer, reader = {}, {}
+    contextvars.Context().run(lambda: (
+        db_connections.bind_write_marker(writer),
+        db_connections.note_primary_write(),
+    ))
+
+    assert _read_connection(reader) == 'replica'
+
+
+def test_stale_write_marker_allows_replica(replica_configured, monkeypatch):
+    session_state = {db_connections._WRITE_MARKER_KEY: 0.0}
+    monkeypatch.setattr(db_connections.time, 'monotonic', lambda: 100.0)
+
+    assert _read_connection(session_state) == 'replica'